@@ -3,22 +3,33 @@
 Scraper Portable - Version auto-installable
 Fonctionne sur n'importe quelle machine avec Python 3.7+
 
-Usage: python portable_scraper.py
+Usage: python portable_scraper.py                       (mode interactif)
+       python portable_scraper.py https://example.com   (sans question)
+       python portable_scraper.py -f sites.txt --parallel-sites 4
 """
 
 from urllib.parse import urljoin, urlparse, urldefrag
 from dataclasses import dataclass, asdict
+from collections import OrderedDict
 from typing import Dict, List, Set, Optional, Tuple
 import logging
 import asyncio
+import bisect
+import importlib.util
 import re
 import sys
 import os
 import subprocess
+import threading
+import heapq
 import tempfile
 import shutil
 from pathlib import Path
 import json
+import gzip
+import math
+import hashlib
+import sqlite3
 import time
 from datetime import datetime
 
@@ -76,31 +87,97 @@ def install_package(package):
                 return False
 
 
-def ensure_dependencies():
-    """S'assure que toutes les dépendances sont installées"""
-    print("🔧 Vérification des dépendances...")
+# Dépendances : nom du paquet pip -> spécification d'installation
+DEPENDENCIES = {
+    "requests": "requests>=2.25.0",
+    "aiohttp": "aiohttp>=3.8.0",
+    "beautifulsoup4": "beautifulsoup4>=4.11.0",
+    "lxml": "lxml>=4.9.0",
+    "supabase": "supabase>=1.0.0",
+    "spacy": "spacy>=3.5.0",
+    "python-dotenv": "python-dotenv>=1.0.0",
+}
+
+# Nom du module importable quand il diffère du paquet pip
+IMPORT_NAMES = {"beautifulsoup4": "bs4", "python-dotenv": "dotenv"}
+
+# Empreinte du dernier environnement vérifié (évite de tout revérifier)
+ENV_FINGERPRINT_FILE = Path.home() / ".cache" / "portable_scraper" / "environment.json"
+
+
+def is_installed(module: str) -> bool:
+    """Vérifie qu'un paquet est importable, sans l'importer"""
+    return importlib.util.find_spec(IMPORT_NAMES.get(module, module)) is not None
+
+
+def environment_fingerprint() -> Optional[dict]:
+    """Empreinte de l'environnement : interpréteur, versions, modèle spaCy"""
+    try:
+        from importlib import metadata
+    except ImportError:  # Python 3.7
+        return None
+
+    packages = {}
+    for package in DEPENDENCIES:
+        try:
+            packages[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            packages[package] = None
 
-    dependencies = {
-        "requests": "requests>=2.25.0",
-        "beautifulsoup4": "beautifulsoup4>=4.11.0",
-        "lxml": "lxml>=4.9.0",
-        "supabase": "supabase>=1.0.0",
-        "spacy": "spacy>=3.5.0",
-        "python-dotenv": "python-dotenv>=1.0.0",
+    return {
+        "python": sys.executable,
+        "python_version": sys.version,
+        "packages": packages,
+        "spacy_model": installed_spacy_model(),
     }
 
+
+def load_environment_fingerprint() -> Optional[dict]:
+    """Dernière empreinte enregistrée (None si absente ou illisible)"""
+    try:
+        with open(ENV_FINGERPRINT_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_environment_fingerprint(fingerprint: Optional[dict]):
+    """Enregistre l'empreinte d'un environnement vérifié"""
+    if fingerprint is None:
+        return
+    try:
+        ENV_FINGERPRINT_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(ENV_FINGERPRINT_FILE, "w", encoding="utf-8") as f:
+            json.dump(fingerprint, f, indent=2)
+    except OSError as e:
+        print(f"  ⚠️  Empreinte de l'environnement non enregistrée : {e}")
+
+
+def ensure_dependencies(force: bool = False):
+    """S'assure que toutes les dépendances sont installées
+
+    Si l'environnement n'a pas changé depuis la dernière vérification
+    réussie (même interpréteur, mêmes versions, même modèle spaCy), la
+    vérification est sautée.
+    """
+    fingerprint = environment_fingerprint()
+    if (
+        not force
+        and fingerprint is not None
+        and fingerprint == load_environment_fingerprint()
+    ):
+        print("✅ Dépendances déjà vérifiées (environnement inchangé)")
+        return True
+
+    print("🔧 Vérification des dépendances...")
+
+    dependencies = DEPENDENCIES
     missing = []
 
     for module, package in dependencies.items():
-        try:
-            if module == "beautifulsoup4":
-                import bs4
-            elif module == "python-dotenv":
-                import dotenv
-            else:
-                __import__(module)
+        if is_installed(module):
             print(f"  ✅ {module}")
-        except ImportError:
+        else:
             missing.append(package)
             print(f"  ❌ {module} manquant")
 
@@ -114,121 +191,104 @@ def ensure_dependencies():
                 print(f"  ❌ Échec installation {package}")
                 return False
 
-        # Après installation, forcer le rechargement des modules
+        # Après installation, vider les caches de recherche de modules
         print("\n🔄 Vérification post-installation...")
+        importlib.invalidate_caches()
         for module, package in dependencies.items():
-            try:
-                # Forcer le rechargement si le module était déjà importé
-                if module in sys.modules:
-                    del sys.modules[module]
-
-                if module == "beautifulsoup4":
-                    import bs4
-                elif module == "python-dotenv":
-                    import dotenv
-                else:
-                    __import__(module)
+            if is_installed(module):
                 print(f"  ✅ {module} vérifié")
-            except ImportError:
+            else:
                 print(f"  ❌ {module} toujours manquant après installation")
                 print(
                     f"  ℹ️  Essayez d'activer un environnement virtuel ou utilisez 'python3 -m venv venv && source venv/bin/activate' avant de relancer"
                 )
                 return False
 
-    # Vérifier et installer spaCy model
-    try:
-        # Forcer le rechargement de spacy si déjà importé
-        if "spacy" in sys.modules:
-            del sys.modules["spacy"]
-        import spacy
+    # Vérifier le modèle spaCy sans le charger (chargé plus tard, à la demande)
+    importlib.invalidate_caches()
+    model = installed_spacy_model()
+    if model == "fr_core_news_sm":
+        print("  ✅ Modèle spaCy français")
+    elif model == "en_core_web_sm":
+        print("  ✅ Modèle spaCy anglais")
+    else:
+        print("  📥 Installation modèle spaCy français...")
+        # Essayer plusieurs méthodes d'installation pour spaCy
+        success = False
+        for args in [
+            [sys.executable, "-m", "spacy", "download", "fr_core_news_sm"],
+            [
+                sys.executable,
+                "-m",
+                "pip",
+                "install",
+                "https://github.com/explosion/spacy-models/releases/download/fr_core_news_sm-3.7.0/fr_core_news_sm-3.7.0-py3-none-any.whl",
+                "--break-system-packages",
+                "--user",
+            ],
+            [
+                sys.executable,
+                "-m",
+                "pip",
+                "install",
+                "https://github.com/explosion/spacy-models/releases/download/fr_core_news_sm-3.7.0/fr_core_news_sm-3.7.0-py3-none-any.whl",
+                "--user",
+            ],
+        ]:
+            if (
+                subprocess.call(
+                    args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+                == 0
+            ):
+                success = True
+                break
 
-        try:
-            nlp = spacy.load("fr_core_news_sm")
-            print("  ✅ Modèle spaCy français")
-        except OSError:
-            try:
-                nlp = spacy.load("en_core_web_sm")
-                print("  ✅ Modèle spaCy anglais")
-            except OSError:
-                print("  📥 Installation modèle spaCy français...")
-                # Essayer plusieurs méthodes d'installation pour spaCy
-                success = False
-                for args in [
-                    [sys.executable, "-m", "spacy", "download", "fr_core_news_sm"],
-                    [
-                        sys.executable,
-                        "-m",
-                        "pip",
-                        "install",
-                        "https://github.com/explosion/spacy-models/releases/download/fr_core_news_sm-3.7.0/fr_core_news_sm-3.7.0-py3-none-any.whl",
-                        "--break-system-packages",
-                        "--user",
-                    ],
-                    [
-                        sys.executable,
-                        "-m",
-                        "pip",
-                        "install",
-                        "https://github.com/explosion/spacy-models/releases/download/fr_core_news_sm-3.7.0/fr_core_news_sm-3.7.0-py3-none-any.whl",
-                        "--user",
-                    ],
-                ]:
-                    if (
-                        subprocess.call(
-                            args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-                        )
-                        == 0
-                    ):
-                        success = True
-                        break
+        if success:
+            print("  ✅ Modèle spaCy français installé")
+        else:
+            print("  ⚠️  Échec modèle français, tentative anglais...")
+            success = False
+            for args in [
+                [sys.executable, "-m", "spacy", "download", "en_core_web_sm"],
+                [
+                    sys.executable,
+                    "-m",
+                    "pip",
+                    "install",
+                    "https://github.com/explosion/spacy-models/releases/download/en_core_web_sm-3.7.1/en_core_web_sm-3.7.1-py3-none-any.whl",
+                    "--break-system-packages",
+                    "--user",
+                ],
+                [
+                    sys.executable,
+                    "-m",
+                    "pip",
+                    "install",
+                    "https://github.com/explosion/spacy-models/releases/download/en_core_web_sm-3.7.1/en_core_web_sm-3.7.1-py3-none-any.whl",
+                    "--user",
+                ],
+            ]:
+                if (
+                    subprocess.call(
+                        args,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                    )
+                    == 0
+                ):
+                    success = True
+                    break
 
-                if success:
-                    print("  ✅ Modèle spaCy français installé")
-                else:
-                    print("  ⚠️  Échec modèle français, tentative anglais...")
-                    success = False
-                    for args in [
-                        [sys.executable, "-m", "spacy", "download", "en_core_web_sm"],
-                        [
-                            sys.executable,
-                            "-m",
-                            "pip",
-                            "install",
-                            "https://github.com/explosion/spacy-models/releases/download/en_core_web_sm-3.7.1/en_core_web_sm-3.7.1-py3-none-any.whl",
-                            "--break-system-packages",
-                            "--user",
-                        ],
-                        [
-                            sys.executable,
-                            "-m",
-                            "pip",
-                            "install",
-                            "https://github.com/explosion/spacy-models/releases/download/en_core_web_sm-3.7.1/en_core_web_sm-3.7.1-py3-none-any.whl",
-                            "--user",
-                        ],
-                    ]:
-                        if (
-                            subprocess.call(
-                                args,
-                                stdout=subprocess.DEVNULL,
-                                stderr=subprocess.DEVNULL,
-                            )
-                            == 0
-                        ):
-                            success = True
-                            break
-
-                    if success:
-                        print("  ✅ Modèle spaCy anglais installé")
-                    else:
-                        print("  ❌ Impossible d'installer un modèle spaCy")
-                        return False
-    except ImportError:
-        print("  ❌ spaCy non installé correctement")
-        return False
+            if success:
+                print("  ✅ Modèle spaCy anglais installé")
+            else:
+                print("  ❌ Impossible d'installer un modèle spaCy")
+                return False
 
     print("✅ Toutes les dépendances sont prêtes!")
+    # Recalculée : des paquets ont pu être installés entre-temps
+    save_environment_fingerprint(environment_fingerprint())
     return True
 
 
@@ -242,6 +302,58 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# === MODÈLE SPACY PARTAGÉ ===
+
+# Modèles spaCy supportés, par ordre de préférence
+SPACY_MODELS = ["fr_core_news_sm", "en_core_web_sm"]
+
+# Modèles chargés dans ce processus (un par jeu de composants exclus)
+_spacy_models: Dict[tuple, object] = {}
+_spacy_lock = threading.Lock()
+# Les modèles partagés ne sont pas garantis sûrs entre threads (sites du
+# batch) : un seul appel NER à la fois par processus. Pour paralléliser
+# la NER, utiliser le pool d'extraction (un modèle par processus).
+_spacy_ner_lock = threading.Lock()
+
+
+def installed_spacy_model(models: Optional[List[str]] = None) -> Optional[str]:
+    """Premier modèle spaCy installé, détecté sans l'importer ni le charger"""
+    for model in models or SPACY_MODELS:
+        if importlib.util.find_spec(model) is not None:
+            return model
+    return None
+
+
+def get_spacy_model(exclude=()):
+    """Modèle spaCy partagé par tous les extracteurs du processus
+
+    Chargé une seule fois, à la première demande. Renvoie None si spaCy
+    ou aucun modèle n'est disponible (NER désactivée).
+    """
+    key = tuple(exclude)
+    with _spacy_lock:
+        if key not in _spacy_models:
+            _spacy_models[key] = load_spacy_model(list(exclude))
+        return _spacy_models[key]
+
+
+def load_spacy_model(exclude: List[str]):
+    """Charge le premier modèle spaCy disponible (avec fallback)"""
+    try:
+        import spacy
+    except ImportError:
+        logger.warning("spaCy non disponible, NER désactivé")
+        return None
+
+    for model in SPACY_MODELS:
+        try:
+            return spacy.load(model, exclude=exclude)
+        except OSError:
+            continue
+    logger.warning("Aucun modèle spaCy trouvé, NER désactivé")
+    return None
+
+
 @dataclass
 class PersonInfo:
     """Structure pour les informations d'une personne"""
@@ -256,12 +368,35 @@ class PersonInfo:
 
 
 class SimpleSupabaseManager:
-    """Gestionnaire Supabase simplifié"""
-
-    def __init__(self, url: str, key: str):
+    """Gestionnaire Supabase simplifié
+
+    Les personnes sont mises en tampon puis envoyées par lots avec un upsert
+    sur `email` (contrainte unique_email). Par défaut les emails déjà en base
+    sont ignorés (ON CONFLICT DO NOTHING) : avec la clé anon, les politiques
+    RLS de recreate_table.sql n'autorisent pas la mise à jour. Passer
+    `update_existing=True` avec une clé authentifiée pour les écraser.
+    """
+
+    # Mêmes contraintes que la table (CHECK de recreate_table.sql)
+    EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
+    PHONE_RE = re.compile(r"^\+?[0-9\s\.\-\(\)]{8,20}$")
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        batch_size: int = 500,
+        max_retries: int = 3,
+        update_existing: bool = False,
+    ):
         self.url = url
         self.key = key
         self.client = None
+        self.batch_size = max(1, int(batch_size))
+        self.max_retries = max(0, int(max_retries))
+        self.update_existing = update_existing
+        self._buffer: Dict[str, dict] = {}  # email -> ligne à envoyer
+        self._lock = threading.Lock()
 
     def connect(self):
         """Connexion à Supabase"""
@@ -274,20 +409,88 @@ class SimpleSupabaseManager:
             logger.error(f"Connexion Supabase échouée: {e}")
             return False
 
+    def to_row(self, person: PersonInfo) -> Optional[dict]:
+        """Convertit une personne en ligne valide pour la table (None si invalide)"""
+        if not self.EMAIL_RE.fullmatch(person.email or ""):
+            return None
+
+        data = asdict(person)
+        data["created_at"] = datetime.now().isoformat()
+
+        # Supprimer 'poste' car absent de la table Supabase
+        data.pop("poste", None)
+
+        # Un téléphone refusé par la table ferait échouer tout le lot ; la
+        # contrainte n'accepte que NULL ou un numéro ("" est refusé)
+        if not self.PHONE_RE.fullmatch(data["telephone"] or ""):
+            data["telephone"] = None
+        data["confidence"] = round(min(1.0, max(0.0, data["confidence"])), 2)
+        return data
+
     def save_person(self, person: PersonInfo) -> bool:
-        """Sauvegarde une personne"""
+        """Sauvegarde immédiate d'une personne"""
         if not self.client:
             return False
 
+        row = self.to_row(person)
+        return bool(row) and self._upsert([row])
+
+    def add(self, person: PersonInfo) -> int:
+        """Ajoute une personne au tampon, envoie un lot s'il est plein
+
+        Retourne le nombre de lignes écrites par cet appel.
+        """
+        row = self.to_row(person)
+        if row is None:
+            return 0
+
+        with self._lock:
+            # Un même email ne peut apparaître qu'une fois par upsert
+            key = row["email"].lower()
+            previous = self._buffer.get(key)
+            if previous is None or row["confidence"] > previous["confidence"]:
+                self._buffer[key] = row
+
+            if len(self._buffer) < self.batch_size:
+                return 0
+            rows = list(self._buffer.values())
+            self._buffer.clear()
+
+        return self._send_batch(rows)
+
+    def flush(self) -> int:
+        """Envoie tout le tampon, retourne le nombre de lignes écrites"""
+        with self._lock:
+            rows = list(self._buffer.values())
+            self._buffer.clear()
+
+        saved = 0
+        for i in range(0, len(rows), self.batch_size):
+            saved += self._send_batch(rows[i : i + self.batch_size])
+        return saved
+
+    def _send_batch(self, rows: List[dict]) -> int:
+        """Envoie un lot avec nouvelles tentatives (backoff exponentiel)"""
+        if not self.client or not rows:
+            return 0
+
+        for attempt in range(self.max_retries + 1):
+            if self._upsert(rows):
+                print(f"   💾 Lot Supabase : {len(rows)} ligne(s) envoyée(s)")
+                return len(rows)
+            if attempt < self.max_retries:
+                time.sleep(0.5 * 2**attempt)
+
+        print(f"   ⚠️  Lot Supabase de {len(rows)} ligne(s) en échec")
+        return 0
+
+    def _upsert(self, rows: List[dict]) -> bool:
         try:
-            person.created_at = datetime.now().isoformat()
-            data = asdict(person)
-
-            # Supprimer 'poste' car absent de la table Supabase
-            data.pop('poste', None)
-
-            # Insertion simple
-            result = self.client.table("personnes").insert(data).execute()
+            self.client.table("personnes").upsert(
+                rows,
+                on_conflict="email",
+                ignore_duplicates=not self.update_existing,
+            ).execute()
             return True
         except Exception as e:
             logger.debug(f"Erreur sauvegarde: {e}")
@@ -307,30 +510,430 @@ class ExtractedElement:
     confidence: float = 0.0
 
 
+class ParsedPage:
+    """Page HTML analysée une seule fois et partagée entre les étapes
+
+    Le DOM (backend lxml) ainsi que les données dérivées (texte, liens)
+    sont calculés à la première demande puis réutilisés.
+    """
+
+    def __init__(self, html: str, url: str = ""):
+        self.html = html
+        self.url = url
+        self._soup = None
+        self._text = None
+        self._text_lower = None
+        self._anchors = None
+
+    @classmethod
+    def of(cls, page, url: str = "") -> "ParsedPage":
+        """Accepte du HTML brut ou une page déjà analysée"""
+        if isinstance(page, ParsedPage):
+            return page
+        return cls(page, url)
+
+    @property
+    def soup(self):
+        """DOM de la page (parsé une seule fois)"""
+        if self._soup is None:
+            from bs4 import BeautifulSoup, FeatureNotFound
+
+            try:
+                self._soup = BeautifulSoup(self.html, "lxml")
+            except FeatureNotFound:
+                # lxml indisponible : parser standard
+                self._soup = BeautifulSoup(self.html, "html.parser")
+        return self._soup
+
+    @property
+    def text(self) -> str:
+        """Texte complet de la page"""
+        if self._text is None:
+            self._text = self.soup.get_text()
+        return self._text
+
+    @property
+    def text_lower(self) -> str:
+        """Texte complet en minuscules"""
+        if self._text_lower is None:
+            self._text_lower = self.text.lower()
+        return self._text_lower
+
+    @property
+    def anchors(self) -> List[str]:
+        """Valeurs href (nettoyées) de tous les liens de la page"""
+        if self._anchors is None:
+            self._anchors = [
+                a["href"].strip()
+                for a in self.soup.find_all("a", href=True)
+                if isinstance(a["href"], str)
+            ]
+        return self._anchors
+
+
+class ZoneTextIndex:
+    """Index texte d'une zone de profil, construit en un seul parcours
+
+    `text` équivaut à zone.get_text() et `spaced_text` à
+    zone.get_text(separator=" ", strip=True). Chaque morceau de texte est
+    associé à son offset et à son nœud DOM, ce qui permet de retrouver
+    la position dans le HTML sérialisé (calculé une seule fois) sans
+    re-sérialiser la zone pour chaque valeur trouvée.
+    """
+
+    def __init__(self, zone):
+        self.zone = zone
+        self.nodes = []
+        self.starts = []
+        self.spaced_nodes = []
+        self.spaced_starts = []
+        raw_parts = []
+        spaced_parts = []
+        position = 0
+        spaced_position = 0
+
+        for string in zone.strings:
+            self.nodes.append(string)
+            self.starts.append(position)
+            raw_parts.append(string)
+            position += len(string)
+
+            stripped = string.strip()
+            if stripped:
+                if spaced_parts:
+                    spaced_position += 1  # séparateur " "
+                self.spaced_nodes.append(string)
+                self.spaced_starts.append(spaced_position)
+                spaced_parts.append(stripped)
+                spaced_position += len(stripped)
+
+        self.text = "".join(raw_parts)
+        self.spaced_text = " ".join(spaced_parts)
+        self._html = None
+        self._html_starts = None
+        self._found = {}
+        self._node_texts = {}
+
+    @property
+    def html(self) -> str:
+        """HTML de la zone, sérialisé une seule fois"""
+        if self._html is None:
+            self._html = str(self.zone)
+        return self._html
+
+    def find(self, value: str) -> int:
+        """Première position de `value` dans le texte (-1 si absente)"""
+        if value not in self._found:
+            self._found[value] = self.text.find(value)
+        return self._found[value]
+
+    def node_text(self, node) -> str:
+        """Texte d'un nœud de la zone (mémoïsé par nœud)"""
+        key = id(node)
+        if key not in self._node_texts:
+            self._node_texts[key] = node.get_text()
+        return self._node_texts[key]
+
+    def node_at(self, offset: int, spaced: bool = False):
+        """Nœud texte contenant l'offset donné (recherche dichotomique)"""
+        starts = self.spaced_starts if spaced else self.starts
+        nodes = self.spaced_nodes if spaced else self.nodes
+        index = bisect.bisect_right(starts, offset) - 1
+        if index < 0:
+            return None
+        return nodes[index]
+
+    def html_position(self, offset: int, spaced: bool = False) -> int:
+        """Position dans le HTML sérialisé d'un offset du texte"""
+        if offset < 0:
+            return -1
+        if self._html_starts is None:
+            self._index_html()
+
+        starts = self.spaced_starts if spaced else self.starts
+        nodes = self.spaced_nodes if spaced else self.nodes
+        index = bisect.bisect_right(starts, offset) - 1
+        if index < 0:
+            return -1
+
+        html_start = self._html_starts.get(id(nodes[index]), -1)
+        if html_start < 0:
+            return -1
+        shift = offset - starts[index]
+        if spaced:
+            # Le texte espacé ne garde pas les blancs de début de nœud
+            node = nodes[index]
+            shift += len(node) - len(node.lstrip())
+        return html_start + shift
+
+    def _index_html(self):
+        """Repère chaque nœud texte dans le HTML en une passe vers l'avant"""
+        self._html_starts = {}
+        html = self.html
+        cursor = 0
+        for node in self.nodes:
+            rendered = node.output_ready()
+            found = html.find(rendered, cursor)
+            if found < 0:
+                continue
+            self._html_starts[id(node)] = found
+            cursor = found + len(rendered)
+
+
+# Mots qui excluent qu'un texte soit un nom de personne (FR + EN)
+NAME_AVOID_WORDS = {
+    # Navigation & sections (FR/EN)
+    "contact", "contacts",
+    "accueil", "home", "homepage",
+    "société", "company", "corporation",
+    "entreprise", "business",
+    "about", "à propos", "apropos",
+    "services", "service",
+    "produits", "products", "product",
+
+    # Termes génériques (FR/EN)
+    "lorem", "ipsum", "exemple", "example", "sample", "test",
+    "téléphone", "telephone", "phone", "mobile",
+    "email", "mail", "e-mail", "courriel",
+    "adresse", "address", "location",
+    "website", "site", "web",
+
+    # Légal (FR/EN)
+    "mentions", "légales", "legal", "terms",
+    "politique", "policy", "privacy",
+    "confidentialité", "confidential",
+    "copyright", "droits",
+
+    # Champs de formulaire (FR/EN)
+    "portfolio", "portfolios",
+    "prénom", "prenom", "firstname", "first name",
+    "nom", "name", "lastname", "last name", "full name",
+    "message", "messages",
+    "subject", "objet", "sujet",
+    "optionnel", "optional",
+    "formats", "format",
+    "obligatoire", "required", "mandatory",
+    "champ", "field", "input",
+    "formulaire", "form",
+
+    # Éducation (FR/EN)
+    "bac", "bachelor", "degree",
+    "pro", "professional",
+    "recherche", "search", "looking", "seeking",
+    "alternance", "internship", "apprentice",
+    "étudiant", "student",
+
+    # Métiers (FR/EN)
+    "développeur", "developer", "dev",
+    "technicien", "technician", "tech",
+    "ingénieur", "engineer", "engineering",
+    "consultant", "manager", "director",
+    "designer", "architect", "analyst",
+
+    # Soft skills / Descriptions
+    "collaborative", "team player", "player",
+    "passionate", "creative", "innovative",
+    "experienced", "senior", "junior",
+    "full stack", "fullstack", "front end", "backend",
+    "global mindset", "mindset", "global",
+    "problem solver", "solver", "thinker",
+    "detail oriented", "oriented", "driven",
+
+    # Sections de portfolio / Headings
+    "my journey", "journey", "my story", "story",
+    "my work", "my projects", "projects",
+    "my skills", "skills", "my experience",
+    "framer motion", "motion", "live demo", "demo",
+    "years started", "started", "years",
+    "strategy we", "strategy", "launch this", "launch",
+    "get started", "get touch", "lets talk", "let's talk",
+
+    # Technologies
+    "supabase", "firebase", "database",
+    "python", "java", "ruby", "php",
+    "javascript", "typescript", "node",
+    "react", "angular", "vue",
+    "nextjs", "next", "gatsby",
+    "docker", "kubernetes",
+    "linux", "windows", "macos", "ubuntu",
+    "github", "gitlab", "bitbucket",
+    "code", "bash", "shell", "terminal",
+
+    # Villes (FR/EN)
+    "france", "paris", "lyon", "marseille", "toulouse",
+    "london", "new york", "york", "berlin", "madrid",
+
+}
+
+
+def literal_alternation(words) -> str:
+    """Regex équivalente à une liste de mots, factorisée en arbre de préfixes
+
+    Une alternative plate essaie chaque mot à chaque position ; l'arbre
+    ne suit que les préfixes possibles (proche d'un automate Aho-Corasick).
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Un mot se termine ici : la suite est optionnelle
+            pattern = "(?:" + pattern + ")?"
+        return pattern
+
+    return build(trie)
+
+
+class PhoneScanner:
+    """Détection des téléphones en une seule passe sur le texte
+
+    Les formats reconnus (numéro précédé de "tel"/"phone"..., numéros
+    français, internationaux) sont réunis dans une seule regex : le texte
+    n'est parcouru qu'une fois et les correspondances ne se chevauchent pas.
+    Le format libre qui suit un libellé est relu : s'il contient des
+    numéros valides (ex: deux numéros à la suite), ce sont eux qui sont gardés.
+    """
+
+    # Numéros français : 01 23 45 67 89, +33 1 23 45 67 89, 0123456789
+    FRENCH = r"(?:\+33\s?|0)[1-9](?:(?:[\s.-]?\d{2}){4}|\s?\d{8})"
+    # Numéros internationaux
+    INTERNATIONAL = r"\+\d{1,3}[\s.-]?\d{6,14}"
+
+    PATTERN = re.compile(
+        # Numéro annoncé par un libellé : seul le numéro capturé est gardé
+        r"(?:tel|tél|phone|mobile|téléphone)[\s:]+(?P<labelled>[+\d\s.-]{8,20})"
+        rf"|(?P<french>{FRENCH})"
+        rf"|(?P<international>{INTERNATIONAL})",
+        re.I,
+    )
+    NUMBER_PATTERN = re.compile(rf"{FRENCH}|{INTERNATIONAL}")
+
+    def search(self, text: str) -> bool:
+        """Vérifie si le texte contient au moins un téléphone"""
+        return self.PATTERN.search(text) is not None
+
+    def scan(self, text: str, seen: Optional[Set[str]] = None):
+        """Téléphones normalisés et dédoublonnés : (début, fin, numéro)
+
+        `seen` contient les numéros déjà connus ; il est complété au fil
+        de la passe.
+        """
+        if seen is None:
+            seen = set()
+        phones = []
+        pos = 0
+        while True:
+            match = self.PATTERN.search(text, pos)
+            if match is None:
+                return phones
+            group = match.lastgroup
+            start, end = match.span(group)
+
+            spans = []
+            if group == "labelled":
+                # Numéros valides commençant dans le format libre (ils peuvent
+                # déborder de la capture, limitée à 20 caractères)
+                for number in self.NUMBER_PATTERN.finditer(text, start):
+                    if number.start() >= end:
+                        break
+                    spans.append(number.span())
+                if spans:
+                    end = max(end, spans[-1][1])
+            if not spans:
+                spans = [(start, end)]
+
+            for span_start, span_end in spans:
+                phone = self.normalize(text[span_start:span_end])
+                if phone and phone not in seen:
+                    seen.add(phone)
+                    phones.append((span_start, span_end, phone))
+            pos = end
+
+    @staticmethod
+    def normalize(phone: str) -> str:
+        """Normalise un téléphone"""
+        digits = re.sub(r"\D", "", phone)
+        if len(digits) < 8 or len(digits) > 15:
+            return ""
+
+        # Format français
+        if digits.startswith("33") and len(digits) == 11:
+            d = digits[2:]
+            return f"+33 {d[0]} {d[1:3]} {d[3:5]} {d[5:7]} {d[7:9]}"
+        elif digits.startswith("0") and len(digits) == 10:
+            return f"{digits[0:2]} {digits[2:4]} {digits[4:6]} {digits[6:8]} {digits[8:10]}"
+
+        return phone.strip()
+
+
 class IntelligentPersonExtractor:
     """Extracteur intelligent qui analyse la proximité et le contexte"""
 
-    def __init__(self):
+    # Composants spaCy inutiles pour la NER (seuls tok2vec et ner servent)
+    NER_EXCLUDED_PIPES = [
+        "tagger", "morphologizer", "parser", "senter",
+        "attribute_ruler", "lemmatizer",
+    ]
+    # Longueur maximum de texte analysé par zone
+    NER_MAX_CHARS = 5000
+    # Verdicts de is_likely_name mémorisés (vidés au-delà)
+    NAME_VERDICTS_MAX = 50_000
+
+    def __init__(self, ner_batch_size: int = 64):
+        # NER dans le processus courant : le parallélisme passe par le pool
+        # d'extraction (EXTRACTION_WORKERS), dont chaque worker garde son
+        # modèle chargé ; nlp.pipe(n_process=...) relancerait des processus
+        # et recopierait le modèle à chaque page
+        self.ner_batch_size = max(1, ner_batch_size)
         self.setup_patterns()
-        self.nlp = self.load_spacy()
+        # Modèle spaCy partagé, chargé à la première NER
+        self._nlp = None
+        self._nlp_loaded = False
 
     def setup_patterns(self):
         """Configure les patterns regex améliorés"""
+        # Filtre de noms (is_likely_name) : mots à éviter en une seule regex
+        self.name_avoid_pattern = re.compile(literal_alternation(NAME_AVOID_WORDS))
+
+        # Patterns qui NE ressemblent PAS à des noms
+        self.name_bad_pattern = re.compile(
+            r"^\d"  # Commence par un chiffre (dont les dates)
+            r"|[^\w\s\-àâäéèêëïîôöùûüÿç\.]"  # Caractères bizarres
+            r"|^[a-z]"  # Commence par minuscule (sauf exceptions)
+            r"|\.com|\.fr|\.org"  # URLs
+            r"|@"  # Emails
+        )
+
+        # Patterns qui ressemblent à des noms (EXIGER prénom + nom)
+        self.full_name_pattern = re.compile(
+            # Marie Dupont (au moins 2 mots)
+            r"[A-ZÀÂÄÉÈÊËÏÎÔÖÙÛÜŸÇ][a-zàâäéèêëïîôöùûüÿç]+\s+[A-ZÀÂÄÉÈÊËÏÎÔÖÙÛÜŸÇ][a-zàâäéèêëïîôöùûüÿç]+"
+            # Jean-Pierre Martin (avec tiret)
+            r"|[A-ZÀÂÄÉÈÊËÏÎÔÖÙÛÜŸÇ][a-zàâäéèêëïîôöùûüÿç]+\-[A-ZÀÂÄÉÈÊËÏÎÔÖÙÛÜŸÇ][a-zàâäéèêëïîôöùûüÿç]+\s+[A-ZÀÂÄÉÈÊËÏÎÔÖÙÛÜŸÇ]"
+            # M. Dupont, Mme Martin
+            r"|(?:M\.|Mme|Dr|Pr)\s+[A-ZÀÂÄÉÈÊËÏÎÔÖÙÛÜŸÇ][a-zàâäéèêëïîôöùûüÿç]+"
+        )
+        self.name_verdicts: Dict[str, bool] = {}
+
         # Email pattern amélioré
         self.email_pattern = re.compile(
             r"\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b"
         )
 
-        # Phone patterns français améliorés avec contexte
-        self.phone_patterns = [
-            re.compile(
-                r"(?:tel|tél|phone|mobile|téléphone)[\s:]+([+\d\s.-]{8,20})", re.I
-            ),
-            re.compile(r"(?:\+33\s?|0)([1-9])(?:[\s.-]?\d{2}){4}"),
-            re.compile(r"(?:\+33\s?|0)([1-9])\s?\d{8}"),
-            re.compile(r"\+\d{1,3}[\s.-]?\d{6,14}"),
-            re.compile(r"0[1-9](?:[\s.-]?\d{2}){4}"),
-        ]
+        # Téléphones : un seul scanner pour tous les formats
+        self.phone_scanner = PhoneScanner()
 
         # Patterns de contexte pour identifier les zones de profil
         self.profile_contexts = [
@@ -350,21 +953,22 @@ class IntelligentPersonExtractor:
             ),
         ]
 
-    def load_spacy(self):
-        """Charge spaCy avec fallback"""
-        try:
-            import spacy
+    @property
+    def nlp(self):
+        """Modèle spaCy (partagé dans le processus, chargé à la demande)"""
+        if not self._nlp_loaded:
+            self.load_spacy()
+        return self._nlp
 
-            for model in ["fr_core_news_sm", "en_core_web_sm"]:
-                try:
-                    return spacy.load(model)
-                except OSError:
-                    continue
-            logger.warning("Aucun modèle spaCy trouvé, NER désactivé")
-            return None
-        except ImportError:
-            logger.warning("spaCy non disponible, NER désactivé")
-            return None
+    @nlp.setter
+    def nlp(self, model):
+        self._nlp = model
+        self._nlp_loaded = True
+
+    def load_spacy(self):
+        """Charge le modèle spaCy partagé, réduit à la NER (plus rapide)"""
+        self.nlp = get_spacy_model(self.NER_EXCLUDED_PIPES)
+        return self._nlp
 
     def extract_names_from_html_structure(self, zone):
         """Extrait les noms directement depuis la structure HTML - TRÈS PRÉCIS"""
@@ -414,95 +1018,22 @@ class IntelligentPersonExtractor:
         # Nettoyer le texte
         text = text.strip()
 
+        # Verdicts mémorisés : les mêmes titres reviennent sur chaque page
+        verdict = self.name_verdicts.get(text)
+        if verdict is None:
+            if len(self.name_verdicts) >= self.NAME_VERDICTS_MAX:
+                self.name_verdicts.clear()
+            verdict = self.name_verdicts[text] = self.check_name(text)
+        return verdict
+
+    def check_name(self, text: str) -> bool:
+        """Règles de is_likely_name, appliquées à un texte nettoyé"""
         # Trop court ou trop long
         if len(text) < 2 or len(text) > 50:
             return False
 
         # Contient des mots à éviter (FR + EN)
-        avoid_words = {
-            # Navigation & sections (FR/EN)
-            "contact", "contacts",
-            "accueil", "home", "homepage",
-            "société", "company", "corporation",
-            "entreprise", "business",
-            "about", "à propos", "apropos",
-            "services", "service",
-            "produits", "products", "product",
-
-            # Termes génériques (FR/EN)
-            "lorem", "ipsum", "exemple", "example", "sample", "test",
-            "téléphone", "telephone", "phone", "mobile",
-            "email", "mail", "e-mail", "courriel",
-            "adresse", "address", "location",
-            "website", "site", "web",
-
-            # Légal (FR/EN)
-            "mentions", "légales", "legal", "terms",
-            "politique", "policy", "privacy",
-            "confidentialité", "confidential",
-            "copyright", "droits",
-
-            # Champs de formulaire (FR/EN)
-            "portfolio", "portfolios",
-            "prénom", "prenom", "firstname", "first name",
-            "nom", "name", "lastname", "last name", "full name",
-            "message", "messages",
-            "subject", "objet", "sujet",
-            "optionnel", "optional",
-            "formats", "format",
-            "obligatoire", "required", "mandatory",
-            "champ", "field", "input",
-            "formulaire", "form",
-
-            # Éducation (FR/EN)
-            "bac", "bachelor", "degree",
-            "pro", "professional",
-            "recherche", "search", "looking", "seeking",
-            "alternance", "internship", "apprentice",
-            "étudiant", "student",
-
-            # Métiers (FR/EN)
-            "développeur", "developer", "dev",
-            "technicien", "technician", "tech",
-            "ingénieur", "engineer", "engineering",
-            "consultant", "manager", "director",
-            "designer", "architect", "analyst",
-
-            # Soft skills / Descriptions
-            "collaborative", "team player", "player",
-            "passionate", "creative", "innovative",
-            "experienced", "senior", "junior",
-            "full stack", "fullstack", "front end", "backend",
-            "global mindset", "mindset", "global",
-            "problem solver", "solver", "thinker",
-            "detail oriented", "oriented", "driven",
-
-            # Sections de portfolio / Headings
-            "my journey", "journey", "my story", "story",
-            "my work", "my projects", "projects",
-            "my skills", "skills", "my experience",
-            "framer motion", "motion", "live demo", "demo",
-            "years started", "started", "years",
-            "strategy we", "strategy", "launch this", "launch",
-            "get started", "get touch", "lets talk", "let's talk",
-
-            # Technologies
-            "supabase", "firebase", "database",
-            "python", "java", "ruby", "php",
-            "javascript", "typescript", "node",
-            "react", "angular", "vue",
-            "nextjs", "next", "gatsby",
-            "docker", "kubernetes",
-            "linux", "windows", "macos", "ubuntu",
-            "github", "gitlab", "bitbucket",
-            "code", "bash", "shell", "terminal",
-
-            # Villes (FR/EN)
-            "france", "paris", "lyon", "marseille", "toulouse",
-            "london", "new york", "york", "berlin", "madrid",
-        }
-
-        if any(word in text.lower() for word in avoid_words):
+        if self.name_avoid_pattern.search(text.lower()):
             return False
 
         # Contient trop de mots (probablement pas un nom)
@@ -511,31 +1042,11 @@ class IntelligentPersonExtractor:
             return False
 
         # Patterns qui NE ressemblent PAS à des noms
-        bad_patterns = [
-            r"^\d",  # Commence par un chiffre
-            r"[^\w\s\-àâäéèêëïîôöùûüÿç\.]",  # Caractères bizarres
-            r"^[a-z]",  # Commence par minuscule (sauf exceptions)
-            r"\.com|\.fr|\.org",  # URLs
-            r"@",  # Emails
-            r"^\d{2}/\d{2}",  # Dates
-        ]
-
-        for pattern in bad_patterns:
-            if re.search(pattern, text):
-                return False
-
-        # Patterns qui ressemblent à des noms (EXIGER prénom + nom)
-        name_patterns = [
-            # Marie Dupont (au moins 2 mots)
-            r"^[A-ZÀÂÄÉÈÊËÏÎÔÖÙÛÜŸÇ][a-zàâäéèêëïîôöùûüÿç]+\s+[A-ZÀÂÄÉÈÊËÏÎÔÖÙÛÜŸÇ][a-zàâäéèêëïîôöùûüÿç]+",
-            # Jean-Pierre Martin (avec tiret)
-            r"^[A-ZÀÂÄÉÈÊËÏÎÔÖÙÛÜŸÇ][a-zàâäéèêëïîôöùûüÿç]+\-[A-ZÀÂÄÉÈÊËÏÎÔÖÙÛÜŸÇ][a-zàâäéèêëïîôöùûüÿç]+\s+[A-ZÀÂÄÉÈÊËÏÎÔÖÙÛÜŸÇ]",
-            # M. Dupont, Mme Martin
-            r"^(?:M\.|Mme|Dr|Pr)\s+[A-ZÀÂÄÉÈÊËÏÎÔÖÙÛÜŸÇ][a-zàâäéèêëïîôöùûüÿç]+",
-        ]
+        if self.name_bad_pattern.search(text):
+            return False
 
         # Doit correspondre à un pattern ET avoir au moins 2 mots (sauf si préfixe M./Mme)
-        has_valid_pattern = any(re.match(pattern, text) for pattern in name_patterns)
+        has_valid_pattern = self.full_name_pattern.match(text) is not None
         has_two_words = len(words) >= 2 or any(text.startswith(prefix) for prefix in ["M.", "Mme", "Dr", "Pr"])
 
         return has_valid_pattern and has_two_words
@@ -559,39 +1070,73 @@ class IntelligentPersonExtractor:
 
         return min(0.95, max(0.5, base_confidence))
 
+    # Indices de zone de profil dans class / id (équivalent des sélecteurs
+    # CSS [class*="..."] et [id*="..."])
+    PROFILE_CLASS_HINTS = (
+        "team", "staff", "member", "contact", "about",
+        "profile", "person", "employee", "card",
+    )
+    PROFILE_ID_HINTS = ("team", "staff", "contact")
+    SECTION_TAGS = ("div", "section", "article", "main")
+
     def identify_profile_zones(self, soup):
-        """Identifie les zones HTML qui peuvent contenir des profils"""
-        profile_zones = []
+        """Identifie les zones HTML qui peuvent contenir des profils
+
+        Un seul parcours du DOM, des feuilles vers la racine : les
+        indicateurs (nombre d'emails, téléphone, contexte) de chaque nœud
+        sont calculés sur son texte propre puis cumulés avec ceux de ses
+        enfants. On ne garde que des zones sans chevauchement, pour ne pas
+        réanalyser la même fiche une fois par conteneur englobant.
+        """
+        from bs4 import CData, NavigableString, Tag
+
+        text_types = (NavigableString, CData)
+        stats = {}
+        stack = [(soup, False)]
+
+        while stack:
+            node, visited = stack.pop()
+            children = [child for child in node.children if isinstance(child, Tag)]
+            if not visited:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(children))
+                continue
 
-        # Chercher des divs/sections avec des classes/ids suggestifs
-        profile_selectors = [
-            '[class*="team"]',
-            '[class*="staff"]',
-            '[class*="member"]',
-            '[class*="contact"]',
-            '[class*="about"]',
-            '[class*="profile"]',
-            '[class*="person"]',
-            '[class*="employee"]',
-            '[class*="card"]',
-            '[id*="team"]',
-            '[id*="staff"]',
-            '[id*="contact"]',
-        ]
+            own_text = "".join(
+                child for child in node.children if type(child) in text_types
+            ).lower()
+            emails = own_text.count("@")
+            has_phone = False
+            has_context = False
+            # Zones retenues : par sélecteurs, et par sections (repli)
+            selected = []
+            sections = []
+            for child in children:
+                child_stats = stats.pop(id(child))
+                emails += child_stats[0]
+                has_phone = has_phone or child_stats[1]
+                has_context = has_context or child_stats[2]
+                selected.extend(child_stats[3])
+                sections.extend(child_stats[4])
+
+            if own_text:
+                if not has_phone:
+                    has_phone = self.phone_scanner.search(own_text)
+                if not has_context:
+                    has_context = any(
+                        pattern.search(own_text) for pattern in self.profile_contexts
+                    )
 
-        for selector in profile_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                if self.contains_person_indicators(element):
-                    profile_zones.append(element)
+            if emails and (has_phone or has_context):
+                if self.is_profile_candidate(node):
+                    selected = self.select_zones(node, emails, selected)
+                if node.name in self.SECTION_TAGS:
+                    sections = self.select_zones(node, emails, sections)
 
-        # Si pas de zones spécifiques, analyser par sections
-        if not profile_zones:
-            for tag in ["div", "section", "article", "main"]:
-                elements = soup.find_all(tag)
-                for element in elements:
-                    if self.contains_person_indicators(element):
-                        profile_zones.append(element)
+            stats[id(node)] = (emails, has_phone, has_context, selected, sections)
+
+        _, _, _, selected, sections = stats[id(soup)]
+        profile_zones = [zone for zone, _ in selected or sections]
 
         # En dernier recours, utiliser le body entier par chunks
         if not profile_zones:
@@ -599,28 +1144,78 @@ class IntelligentPersonExtractor:
 
         return profile_zones
 
-    def contains_person_indicators(self, element):
-        """Vérifie si un élément contient des indicateurs de profil"""
-        text = element.get_text().lower()
-
-        # Vérifier présence d'email ET (nom OU téléphone)
-        has_email = "@" in text
-        has_phone = any(pattern.search(text) for pattern in self.phone_patterns)
-        has_name_context = any(
-            pattern.search(text) for pattern in self.profile_contexts
+    def is_profile_candidate(self, element) -> bool:
+        """Vérifie si la classe ou l'id suggère une zone de profil"""
+        classes = element.get("class") or ""
+        if not isinstance(classes, str):
+            classes = " ".join(classes)
+        element_id = element.get("id") or ""
+        return any(hint in classes for hint in self.PROFILE_CLASS_HINTS) or any(
+            hint in element_id for hint in self.PROFILE_ID_HINTS
         )
 
-        return has_email and (has_phone or has_name_context)
+    def select_zones(self, node, emails: int, inner_zones: list) -> list:
+        """Choisit entre un nœud qualifié et les zones qu'il contient
+
+        Un nœud avec un seul email est une fiche : on le garde entier (il
+        contient aussi le nom). S'il en contient plusieurs, on garde les
+        fiches internes quand elles couvrent tous ses emails, sinon le
+        nœud lui-même.
+        """
+        if emails > 1 and sum(count for _, count in inner_zones) >= emails:
+            return inner_zones
+        return [(node, emails)]
+
+    def extract_zones_elements(self, zones) -> list:
+        """Extrait les éléments de plusieurs zones, NER groupée en un lot
+
+        Les textes de toutes les zones passent ensemble dans nlp.pipe au
+        lieu d'un appel au modèle par zone.
+        """
+        indexes = [ZoneTextIndex(zone) for zone in zones]
+        entities = self.find_person_entities([index.spaced_text for index in indexes])
+        return [
+            self.extract_elements_with_position(zone, index, zone_entities)
+            for zone, index, zone_entities in zip(zones, indexes, entities)
+        ]
+
+    def find_person_entities(self, texts: List[str]) -> list:
+        """Entités personnes (texte, début, fin) de chaque texte via nlp.pipe"""
+        if not self.nlp or not texts:
+            return [[] for _ in texts]
+        try:
+            # nlp.pipe est paresseux : les documents sont lus sous le verrou
+            with _spacy_ner_lock:
+                docs = list(
+                    self.nlp.pipe(
+                        (text[: self.NER_MAX_CHARS] for text in texts),
+                        batch_size=self.ner_batch_size,
+                    )
+                )
+            return [
+                [
+                    (ent.text, ent.start_char, ent.end_char)
+                    for ent in doc.ents
+                    if ent.label_ in ("PER", "PERSON")
+                ]
+                for doc in docs
+            ]
+        except Exception as e:
+            logger.debug(f"Erreur spaCy: {e}")
+            return [[] for _ in texts]
 
-    def extract_elements_with_position(self, zone):
+    def extract_elements_with_position(self, zone, index=None, entities=None):
         """Extrait tous les éléments avec leur position dans la zone"""
         elements = []
-        text = zone.get_text()
+        if index is None:
+            index = ZoneTextIndex(zone)
+        text = index.text
 
         # 1. PRIORITÉ - Extraire depuis les balises mailto: et tel:
-        elements.extend(self.extract_from_mailto_tel_tags(zone))
+        elements.extend(self.extract_from_mailto_tel_tags(zone, index))
 
         # 2. Extraire emails depuis le texte (fallback)
+        seen_emails = {elem.value for elem in elements if elem.type == "email"}
         for match in self.email_pattern.finditer(text):
             email = match.group()
             # Filtrer les emails invalides ou placeholder
@@ -632,45 +1227,43 @@ class IntelligentPersonExtractor:
             ]
             if not any(x in email.lower() for x in invalid_patterns):
                 # Éviter les doublons avec les balises mailto:
-                if not any(
-                    elem.value == email for elem in elements if elem.type == "email"
-                ):
+                if email not in seen_emails:
+                    seen_emails.add(email)
                     context = self.get_context(text, match.start(), match.end())
                     elements.append(
                         ExtractedElement(
                             type="email",
                             value=email,
                             position=match.start(),
-                            html_position=str(zone).find(email),
+                            html_position=index.html_position(match.start()),
                             context=context,
-                            html_element=self.get_parent_tag(zone, email),
+                            html_element=self.get_parent_tag(index, match.start()),
                             confidence=0.7,  # Moins fiable que mailto:
                         )
                     )
 
         # 3. Extraire téléphones depuis le texte (fallback)
-        for pattern in self.phone_patterns:
-            for match in pattern.finditer(text):
-                phone = self.normalize_phone(match.group())
-                if phone and not any(
-                    elem.value == phone for elem in elements if elem.type == "phone"
-                ):
-                    context = self.get_context(text, match.start(), match.end())
-                    elements.append(
-                        ExtractedElement(
-                            type="phone",
-                            value=phone,
-                            position=match.start(),
-                            html_position=str(zone).find(match.group()),
-                            context=context,
-                            html_element=self.get_parent_tag(zone, match.group()),
-                            confidence=0.6,  # Moins fiable que tel:
-                        )
-                    )
+        # Une seule passe ; les numéros déjà vus (tel:) sont ignorés
+        seen_phones = {elem.value for elem in elements if elem.type == "phone"}
+        for start, end, phone in self.phone_scanner.scan(text, seen_phones):
+            context = self.get_context(text, start, end)
+            elements.append(
+                ExtractedElement(
+                    type="phone",
+                    value=phone,
+                    position=start,
+                    html_position=index.html_position(start),
+                    context=context,
+                    html_element=self.get_parent_tag(index, start),
+                    confidence=0.6,  # Moins fiable que tel:
+                )
+            )
 
         # 4. Extraire noms avec structure HTML (PRIORITÉ) + proximité
         html_names = self.extract_names_from_html_structure(zone)
-        proximity_names = self.extract_names_with_proximity(zone, elements)
+        proximity_names = self.extract_names_with_proximity(
+            zone, elements, index, entities
+        )
 
         # Fusionner en évitant les doublons
         all_names = html_names + proximity_names
@@ -686,9 +1279,11 @@ class IntelligentPersonExtractor:
 
         return sorted(elements, key=lambda x: x.position)
 
-    def extract_from_mailto_tel_tags(self, zone):
+    def extract_from_mailto_tel_tags(self, zone, index=None):
         """Extrait emails et téléphones depuis les balises mailto: et tel:"""
         elements = []
+        if index is None:
+            index = ZoneTextIndex(zone)
 
         # Chercher les liens mailto:
         for mailto_link in zone.find_all("a", href=re.compile(r"^mailto:", re.I)):
@@ -700,12 +1295,11 @@ class IntelligentPersonExtractor:
                 # Trouver le nom associé dans le texte du lien ou à proximité
                 link_text = mailto_link.get_text().strip()
                 parent_text = (
-                    mailto_link.parent.get_text() if mailto_link.parent else ""
+                    index.node_text(mailto_link.parent) if mailto_link.parent else ""
                 )
 
                 # Position approximative dans le texte global
-                full_text = zone.get_text()
-                position = full_text.find(email) if email in full_text else 0
+                position = max(index.find(email), 0)
 
                 elements.append(
                     ExtractedElement(
@@ -727,10 +1321,11 @@ class IntelligentPersonExtractor:
                 normalized_tel = self.normalize_phone(tel)
                 if normalized_tel:
                     link_text = tel_link.get_text().strip()
-                    parent_text = tel_link.parent.get_text() if tel_link.parent else ""
+                    parent_text = (
+                        index.node_text(tel_link.parent) if tel_link.parent else ""
+                    )
 
-                    full_text = zone.get_text()
-                    position = full_text.find(tel) if tel in full_text else 0
+                    position = max(index.find(tel), 0)
 
                     elements.append(
                         ExtractedElement(
@@ -753,21 +1348,30 @@ class IntelligentPersonExtractor:
         context_end = min(len(text), end + window)
         return text[context_start:context_end].strip()
 
-    def get_parent_tag(self, zone, value):
-        """Trouve le tag HTML parent d'un élément"""
-        try:
-            for elem in zone.find_all(text=re.compile(re.escape(value))):
-                parent = elem.parent
-                if parent:
-                    return parent.name
-        except:
-            pass
+    def get_parent_tag(self, index, offset, spaced=False):
+        """Trouve le tag HTML parent du texte situé à cet offset"""
+        node = index.node_at(offset, spaced)
+        if node is not None and node.parent is not None:
+            return node.parent.name
         return "unknown"
 
-    def extract_names_with_proximity(self, zone, existing_elements):
+    def extract_names_with_proximity(
+        self, zone, existing_elements, index=None, entities=None
+    ):
         """Extrait les noms en se basant sur la proximité avec emails/téléphones"""
         names = []
-        text = zone.get_text(separator=' ', strip=True)
+        if index is None:
+            index = ZoneTextIndex(zone)
+        text = index.spaced_text
+        if entities is None:
+            entities = self.find_person_entities([text])[0]
+
+        # Positions triées des contacts : proximité par recherche dichotomique
+        contact_positions = sorted(
+            elem.position
+            for elem in existing_elements
+            if elem.type in ("email", "phone")
+        )
 
         # D'abord chercher les noms dans les balises mailto: et tel: existantes
         for elem in existing_elements:
@@ -788,35 +1392,36 @@ class IntelligentPersonExtractor:
                         )
                     )
 
-        # Ensuite, utiliser spaCy pour les noms généraux
-        if self.nlp:
-            try:
-                doc = self.nlp(text[:5000])
-                for ent in doc.ents:
-                    if ent.label_ in ("PER", "PERSON") and len(ent.text.strip()) > 2:
-                        name = ent.text.strip()
-                        if self.is_likely_name(name) and not any(elem.value == name for elem in names):
-                            # Calculer la proximité avec les emails/téléphones
-                            proximity_bonus = self.calculate_proximity_to_contacts(
-                                ent.start_char, existing_elements
-                            )
-
-                            context = self.get_context(
-                                text, ent.start_char, ent.end_char
-                            )
-                            names.append(
-                                ExtractedElement(
-                                    type="name",
-                                    value=name,
-                                    position=ent.start_char,
-                                    html_position=str(zone).find(name),
-                                    context=context,
-                                    html_element=self.get_parent_tag(zone, name),
-                                    confidence=0.7 + proximity_bonus,
-                                )
-                            )
-            except Exception as e:
-                logger.debug(f"Erreur spaCy: {e}")
+        name_values = {elem.value for elem in names}
+
+        # Ensuite, les noms généraux trouvés par spaCy (NER en lot)
+        for ent_text, start_char, end_char in entities:
+            name = ent_text.strip()
+            if (
+                len(name) > 2
+                and self.is_likely_name(name)
+                and name not in name_values
+            ):
+                # Calculer la proximité avec les emails/téléphones
+                proximity_bonus = self.calculate_proximity_to_contacts(
+                    start_char, contact_positions
+                )
+                name_values.add(name)
+
+                context = self.get_context(text, start_char, end_char)
+                names.append(
+                    ExtractedElement(
+                        type="name",
+                        value=name,
+                        position=start_char,
+                        html_position=index.html_position(start_char, spaced=True),
+                        context=context,
+                        html_element=self.get_parent_tag(
+                            index, start_char, spaced=True
+                        ),
+                        confidence=0.7 + proximity_bonus,
+                    )
+                )
 
         # Patterns regex avec bonus de proximité
         for pattern in self.name_patterns:
@@ -828,12 +1433,13 @@ class IntelligentPersonExtractor:
                     and not any(
                         x.lower() in name.lower() for x in ["lorem", "ipsum", "example"]
                     )
-                    and not any(elem.value == name for elem in names)
+                    and name not in name_values
                 ):
 
                     proximity_bonus = self.calculate_proximity_to_contacts(
-                        match.start(), existing_elements
+                        match.start(), contact_positions
                     )
+                    name_values.add(name)
 
                     context = self.get_context(text, match.start(), match.end())
                     names.append(
@@ -841,9 +1447,13 @@ class IntelligentPersonExtractor:
                             type="name",
                             value=name,
                             position=match.start(),
-                            html_position=str(zone).find(name),
+                            html_position=index.html_position(
+                                match.start(), spaced=True
+                            ),
                             context=context,
-                            html_element=self.get_parent_tag(zone, name),
+                            html_element=self.get_parent_tag(
+                                index, match.start(), spaced=True
+                            ),
                             confidence=0.6 + proximity_bonus,
                         )
                     )
@@ -876,18 +1486,22 @@ class IntelligentPersonExtractor:
         return names
 
     def calculate_proximity_to_contacts(
-        self, name_position: int, contact_elements: list
+        self, name_position: int, contact_positions: List[int]
     ) -> float:
-        """Calcule un bonus de proximité entre un nom et les contacts"""
-        if not contact_elements:
+        """Calcule un bonus de proximité entre un nom et les contacts
+
+        `contact_positions` : positions triées des emails et téléphones.
+        """
+        if not contact_positions:
             return 0.0
 
-        # Trouver la distance minimum avec un email ou téléphone
-        min_distance = float("inf")
-        for elem in contact_elements:
-            if elem.type in ["email", "phone"]:
-                distance = abs(name_position - elem.position)
-                min_distance = min(min_distance, distance)
+        # Distance minimum : seuls les deux voisins encadrant le nom comptent
+        i = bisect.bisect_left(contact_positions, name_position)
+        min_distance = min(
+            abs(name_position - contact_positions[j])
+            for j in (i - 1, i)
+            if 0 <= j < len(contact_positions)
+        )
 
         # Bonus inversement proportionnel à la distance
         if min_distance <= 50:
@@ -901,18 +1515,7 @@ class IntelligentPersonExtractor:
 
     def normalize_phone(self, phone: str) -> str:
         """Normalise un téléphone"""
-        digits = re.sub(r"\D", "", phone)
-        if len(digits) < 8 or len(digits) > 15:
-            return ""
-
-        # Format français
-        if digits.startswith("33") and len(digits) == 11:
-            d = digits[2:]
-            return f"+33 {d[0]} {d[1:3]} {d[3:5]} {d[5:7]} {d[7:9]}"
-        elif digits.startswith("0") and len(digits) == 10:
-            return f"{digits[0:2]} {digits[2:4]} {digits[4:6]} {digits[6:8]} {digits[8:10]}"
-
-        return phone.strip()
+        return PhoneScanner.normalize(phone)
 
     def cluster_by_proximity(self, elements):
         """Groupe les éléments par proximité et confiance"""
@@ -934,29 +1537,28 @@ class IntelligentPersonExtractor:
             return [elements]
 
         # CAS 2: Plusieurs emails ou clustering classique par proximité
+        # Balayage des éléments triés par position : le seuil ne dépend que
+        # des types, donc seul le dernier élément de chaque type du cluster
+        # (le plus proche) est à comparer.
         clusters = []
         current_cluster = [elements[0]]
+        last_by_type = {elements[0].type: elements[0]}
 
-        for i in range(1, len(elements)):
-            current_elem = elements[i]
-
+        for current_elem in elements[1:]:
             # Vérifier si cet élément doit être ajouté au cluster actuel
-            should_add = False
-
-            for existing_elem in current_cluster:
-                position_distance = abs(current_elem.position - existing_elem.position)
-                max_distance = self.get_proximity_threshold(existing_elem, current_elem)
-
-                if position_distance <= max_distance:
-                    should_add = True
-                    break
+            should_add = any(
+                abs(current_elem.position - existing_elem.position)
+                <= self.get_proximity_threshold(existing_elem, current_elem)
+                for existing_elem in last_by_type.values()
+            )
 
             if should_add:
                 current_cluster.append(current_elem)
             else:
-                if len(current_cluster) > 0:
-                    clusters.append(current_cluster)
+                clusters.append(current_cluster)
                 current_cluster = [current_elem]
+                last_by_type = {}
+            last_by_type[current_elem.type] = current_elem
 
         if current_cluster:
             clusters.append(current_cluster)
@@ -1043,115 +1645,1292 @@ class IntelligentPersonExtractor:
 
 
 class SmartURLPrioritizer:
-    """Système intelligent de priorisation des URLs"""
+    """Système intelligent de priorisation des URLs
+
+    Chaque règle porte sur un segment entier du chemin (/equipe/, /contact)
+    : toutes les règles sont réunies dans une seule table segment -> catégorie,
+    et un chemin est classé en un seul parcours de ses segments.
+    """
+
+    # URLs TRÈS PROMETTEUSES (Score: 10)
+    HIGH_PRIORITY_SEGMENTS = [
+        "equipe", "team", "staff", "personnel",
+        "about-us", "a-propos", "qui-sommes-nous",
+        "contact", "contacts", "nous-contacter",
+        "management", "direction", "dirigeants",
+        "leadership", "executives", "board",
+    ]
+
+    # URLs PROMETTEUSES (Score: 8)
+    MEDIUM_PRIORITY_SEGMENTS = [
+        "about", "apropos",
+        "people", "membres", "member",
+        "our-team", "notre-equipe",
+        "organization", "organisation",
+        "advisors", "conseillers", "founders", "fondateurs",
+    ]
+
+    # URLs MOYENNEMENT PROMETTEUSES (Score: 6)
+    LOW_PRIORITY_SEGMENTS = [
+        "company", "entreprise", "societe",
+        "history", "histoire",
+        "office", "bureau", "offices",
+        "locations", "implantations",
+        "services",
+    ]
+
+    # URLs SPÉCIALISÉES - profils individuels (Score: 9) : un de ces
+    # segments suivi d'un autre segment (/equipe/marie-dupont)
+    INDIVIDUAL_PARENT_SEGMENTS = [
+        "team", "equipe", "staff", "personnel",
+        "contact", "bureau",
+        "member", "membre",
+    ]
+
+    # URLs À ÉVITER (Score: 1)
+    AVOID_SEGMENTS = [
+        "blog", "news", "actualites", "presse",
+        "products", "produits", "catalogue",
+        "legal", "mentions-legales", "cgv",
+        "faq", "aide", "support",
+        "media", "gallery", "galerie",
+        "login", "register", "cart", "panier",
+    ]
+
+    # Catégories par ordre de priorité d'application, et leur score
+    AVOID, INDIVIDUAL, HIGH, MEDIUM, LOW = range(5)
+    RANK_SCORES = {AVOID: 1, INDIVIDUAL: 9, HIGH: 10, MEDIUM: 8, LOW: 6}
+    DEFAULT_SCORE = 5  # URL inconnue = score neutre
+
+    def __init__(self, yield_stats: Optional["URLYieldStats"] = None):
+        # Table unique segment -> meilleure catégorie (rang le plus faible)
+        self.segment_ranks: Dict[str, int] = {}
+        for rank, segments in (
+            (self.LOW, self.LOW_PRIORITY_SEGMENTS),
+            (self.MEDIUM, self.MEDIUM_PRIORITY_SEGMENTS),
+            (self.HIGH, self.HIGH_PRIORITY_SEGMENTS),
+            (self.AVOID, self.AVOID_SEGMENTS),
+        ):
+            for segment in segments:
+                self.segment_ranks[segment] = rank
+        self.individual_parents = set(self.INDIVIDUAL_PARENT_SEGMENTS)
 
-    def __init__(self):
-        # URLs TRÈS PROMETTEUSES (Score: 10)
-        self.high_priority_patterns = [
-            r"/(?:equipe|team|staff|personnel)(?:/|$)",
-            r"/(?:about-us|a-propos|qui-sommes-nous)(?:/|$)",
-            r"/(?:contact|contacts|nous-contacter)(?:/|$)",
-            r"/(?:management|direction|dirigeants)(?:/|$)",
-            r"/(?:leadership|executives|board)(?:/|$)",
-        ]
+        # Scores déjà calculés pendant le crawling
+        self._scores: Dict[str, int] = {}
+        # Rendement appris des sections du site (bonus adaptatif)
+        self.yield_stats = yield_stats or URLYieldStats()
 
-        # URLs PROMETTEUSES (Score: 8)
-        self.medium_priority_patterns = [
-            r"/(?:about|apropos)(?:/|$)",
-            r"/(?:people|membres|member)(?:/|$)",
-            r"/(?:our-team|notre-equipe)(?:/|$)",
-            r"/(?:organization|organisation)(?:/|$)",
-            r"/(?:advisors|conseillers|founders|fondateurs)(?:/|$)",
-        ]
+    def score_url(self, url: str) -> int:
+        """Score une URL selon sa probabilité de contenir des profils"""
+        score = self._scores.get(url)
+        if score is None:
+            score = self._scores[url] = self.score_path(urlparse(url).path.lower())
+        return score
+
+    def priority(self, url: str) -> int:
+        """Priorité dans la file : score de base + bonus appris du site"""
+        return self.score_url(url) + self.yield_stats.bonus(url)
+
+    def record(self, url: str, persons: int) -> bool:
+        """Met à jour le rendement appris ; True si la page avait des contacts"""
+        return self.yield_stats.record(url, persons)
+
+    def score_path(self, path: str) -> int:
+        """Score d'un chemin (en minuscules), en un seul parcours des segments"""
+        # Le premier élément précède le premier "/" : ce n'est pas un segment
+        segments = path.split("/")[1:]
+        best = None
+
+        for i, segment in enumerate(segments):
+            rank = self.segment_ranks.get(segment)
+            if (
+                segment in self.individual_parents
+                and i + 1 < len(segments)
+                and segments[i + 1]
+            ):
+                rank = self.INDIVIDUAL if rank is None else min(rank, self.INDIVIDUAL)
+            if rank is not None and (best is None or rank < best):
+                best = rank
+                if best == self.AVOID:
+                    break
 
-        # URLs MOYENNEMENT PROMETTEUSES (Score: 6)
-        self.low_priority_patterns = [
-            r"/(?:company|entreprise|societe)(?:/|$)",
-            r"/(?:history|histoire)(?:/|$)",
-            r"/(?:office|bureau|offices)(?:/|$)",
-            r"/(?:locations|implantations)(?:/|$)",
-            r"/services(?:/|$)",
-        ]
+        return self.DEFAULT_SCORE if best is None else self.RANK_SCORES[best]
 
-        # URLs SPÉCIALISÉES - profils individuels (Score: 9)
-        self.individual_patterns = [
-            r"/(?:team|equipe|staff|personnel)/[^/]+(?:/|$)",
-            r"/(?:contact|bureau)/[^/]+(?:/|$)",
-            r"/(?:member|membre)/[^/]+(?:/|$)",
-        ]
+    def score_urls(self, urls: list) -> List[Tuple[str, int]]:
+        """(URL, score) triés par score décroissant, puis alphabétiquement"""
+        url_scores = [(url, self.score_url(url)) for url in urls]
+        return sorted(url_scores, key=lambda x: (-x[1], x[0]))
 
-        # URLs À ÉVITER (Score: 1)
-        self.avoid_patterns = [
-            r"/(?:blog|news|actualites|presse)(?:/|$)",
-            r"/(?:products|produits|catalogue)(?:/|$)",
-            r"/(?:legal|mentions-legales|cgv)(?:/|$)",
-            r"/(?:faq|aide|support)(?:/|$)",
-            r"/(?:media|gallery|galerie)(?:/|$)",
-            r"/(?:login|register|cart|panier)(?:/|$)",
-        ]
+    def prioritize_urls(self, urls: list) -> list:
+        """Trie les URLs par ordre de priorité décroissante"""
+        return [url for url, score in self.score_urls(urls)]
+
+
+class URLYieldStats:
+    """Rendement observé des URLs d'un site, appris pendant le crawling
+
+    Pour chaque section (préfixe du chemin : /nos-experts, /nos-experts/paris)
+    et chaque mot du chemin (experts, avocats) : pages visitées et pages où
+    des contacts ont été trouvés. Les URLs en file reçoivent un bonus de
+    type bandit (UCB) : les sections qui donnent des contacts remontent,
+    celles qui n'en donnent jamais descendent, et les sections pas ou peu
+    visitées gardent une prime d'exploration. Les statistiques sont
+    sauvegardées par domaine et reprises au crawl suivant.
+    """
+
+    MAX_BONUS = 8  # Bonus (ou malus) maximum ajouté au score de base
+    EXPLORATION = 0.1  # Poids de la prime d'exploration
+    PRIOR_WEIGHT = 1  # Pages "fictives" au taux moyen du site (lissage)
+    PREFIX_DEPTH = 2  # Profondeur des préfixes de chemin suivis
+    MAX_HISTORY = 100  # Pages gardées par statistique d'un crawl à l'autre
+    IGNORED_TOKENS = {"www", "html", "htm", "php", "asp", "aspx", "index", "page"}
+    TOKEN_RE = re.compile(r"[a-zàâäéèêëïîôöùûüÿç]{3,}")
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.stats: Dict[str, List[int]] = {}  # clé -> [pages, pages avec contacts]
+        self.pages = 0
+        self.hits = 0
+        self._features: Dict[str, List[str]] = {}
+        if path:
+            self.load()
+
+    def features(self, url: str) -> List[str]:
+        """Sections (p:) puis mots (t:) du chemin de l'URL
+
+        Une page fait partie de la section de son dossier (/equipe/marie
+        -> /equipe) ; une page de premier niveau est sa propre section.
+        """
+        keys = self._features.get(url)
+        if keys is None:
+            segments = [s for s in urlparse(url).path.lower().split("/") if s]
+            folders = segments[:-1] or segments
+            keys = [
+                "p:/" + "/".join(folders[:depth])
+                for depth in range(1, min(len(folders), self.PREFIX_DEPTH) + 1)
+            ]
+            tokens = {
+                token
+                for segment in segments
+                for token in self.TOKEN_RE.findall(segment)
+                if token not in self.IGNORED_TOKENS
+            }
+            keys.extend("t:" + token for token in sorted(tokens))
+            self._features[url] = keys
+        return keys
+
+    def record(self, url: str, persons: int) -> bool:
+        """Enregistre le résultat d'une page ; True si elle avait des contacts"""
+        hit = 1 if persons > 0 else 0
+        self.pages += 1
+        self.hits += hit
+        for key in self.features(url):
+            stat = self.stats.setdefault(key, [0, 0])
+            stat[0] += 1
+            stat[1] += hit
+        return bool(hit)
+
+    def bonus(self, url: str) -> int:
+        """Bonus de priorité (UCB) d'après les sections déjà visitées"""
+        if not self.pages:
+            return 0
+
+        baseline = self.hits / self.pages
+        log_pages = math.log(self.pages + 1)
+        best = None
+        keys = self.features(url)
+        for key in keys:
+            stat = self.stats.get(key)
+            if stat:
+                pages, hits = stat
+            elif key is keys[0] and key.startswith("p:"):
+                # Section jamais visitée : à explorer
+                pages, hits = 0, 0
+            else:
+                continue
+            # Taux lissé vers le taux moyen du site + prime d'exploration
+            mean = (hits + self.PRIOR_WEIGHT * baseline) / (pages + self.PRIOR_WEIGHT)
+            ucb = mean + self.EXPLORATION * math.sqrt(log_pages / (pages + 1))
+            best = ucb if best is None else max(best, ucb)
+
+        if best is None:
+            return 0
+        bonus = round(self.MAX_BONUS * (best - baseline))
+        return max(-self.MAX_BONUS, min(self.MAX_BONUS, bonus))
+
+    def load(self):
+        """Reprend les statistiques des crawls précédents (historique plafonné)"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for key, (pages, hits) in state.get("stats", {}).items():
+            if pages > self.MAX_HISTORY:
+                # Garder le taux, mais laisser le nouveau crawl peser
+                hits = round(hits * self.MAX_HISTORY / pages)
+                pages = self.MAX_HISTORY
+            self.stats[key] = [pages, hits]
+        self.pages = state.get("pages", 0)
+        self.hits = state.get("hits", 0)
+
+    def save(self):
+        """Écrit les statistiques de manière atomique"""
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"pages": self.pages, "hits": self.hits, "stats": self.stats},
+                    f,
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                )
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Statistiques d'URLs non sauvegardées: {e}")
+
+
+class URLCanonicalizer:
+    """Forme canonique des URLs : une même page n'entre qu'une fois en file
+
+    Schéma et hôte en minuscules, port par défaut retiré, fragment retiré,
+    index.html/index.php retirés, pas de "/" final, paramètres de suivi
+    (utm_*, fbclid...), de session et de tri retirés, autres paramètres
+    triés. La pagination (page=2) est conservée.
+    """
+
+    STRIP_PARAMS = {
+        # Suivi marketing
+        "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid",
+        "mc_cid", "mc_eid", "_ga", "_gl", "ref_src",
+        # Sessions
+        "phpsessid", "jsessionid", "sessionid", "sid",
+        # Tri et affichage (même contenu, autre ordre)
+        "sort", "order", "orderby", "dir", "direction",
+    }
+    STRIP_PREFIXES = ("utm_",)
+    INDEX_PAGES = {"index.html", "index.htm", "index.php", "default.aspx"}
+    DEFAULT_PORTS = {"http": 80, "https": 443}
 
-        # Compiler les patterns pour la performance
-        self.compiled_patterns = {
-            "high": [re.compile(p, re.I) for p in self.high_priority_patterns],
-            "medium": [re.compile(p, re.I) for p in self.medium_priority_patterns],
-            "low": [re.compile(p, re.I) for p in self.low_priority_patterns],
-            "individual": [re.compile(p, re.I) for p in self.individual_patterns],
-            "avoid": [re.compile(p, re.I) for p in self.avoid_patterns],
+    def __init__(self, extra_strip_params: Optional[List[str]] = None):
+        self.strip_params = self.STRIP_PARAMS | {
+            param.strip().lower() for param in extra_strip_params or [] if param.strip()
         }
 
-    def score_url(self, url: str) -> int:
-        """Score une URL selon sa probabilité de contenir des profils"""
-        path = urlparse(url).path.lower()
+    def canonicalize(self, url: str) -> str:
+        """URL canonique (l'URL d'origine si elle est mal formée)"""
+        from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-        # Vérifier les patterns à éviter d'abord
-        for pattern in self.compiled_patterns["avoid"]:
-            if pattern.search(path):
-                return 1
+        try:
+            parsed = urlsplit(url.strip())
+            port = parsed.port
+        except ValueError:
+            return url
+
+        scheme = parsed.scheme.lower()
+        host = parsed.hostname or ""
+        if ":" in host:
+            host = f"[{host}]"  # IPv6
+        netloc = host
+        if port is not None and port != self.DEFAULT_PORTS.get(scheme):
+            netloc = f"{host}:{port}"
+
+        path = parsed.path or "/"
+        folder, _, last = path.rpartition("/")
+        if last.lower() in self.INDEX_PAGES:
+            path = folder + "/"
+        if len(path) > 1:
+            path = path.rstrip("/") or "/"
+
+        params = sorted(
+            (key, value)
+            for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+            if key.lower() not in self.strip_params
+            and not key.lower().startswith(self.STRIP_PREFIXES)
+        )
+        return urlunsplit((scheme, netloc, path, urlencode(params), ""))
+
+
+class NearDuplicateIndex:
+    """Détection des pages quasi identiques (SimHash 64 bits)
+
+    L'empreinte est calculée sur le texte de la page obtenu par simple
+    nettoyage regex du HTML (sans parser le DOM). Deux pages sont quasi
+    identiques si leurs empreintes diffèrent d'au plus `max_distance` bits
+    et si la seconde n'apporte aucun email nouveau. L'empreinte est découpée
+    en `max_distance + 1` bandes : deux empreintes à distance <= max_distance
+    ont au moins une bande identique, seules celles-ci sont comparées.
+    """
+
+    STRIP_RE = re.compile(
+        r"<(script|style|noscript)\b.*?</\1\s*>|<!--.*?-->|<[^>]+>", re.S | re.I
+    )
+    WORD_RE = re.compile(r"\w+")
+    EMAIL_RE = re.compile(r"[\w.%+-]+@[\w.-]+\.[a-z]{2,}")
+    SHINGLE_SIZE = 3  # Mots par fragment comparé
+    MAX_DISTANCE = 7  # Au-delà, des pages réellement différentes se confondent
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = max(0, min(int(max_distance), self.MAX_DISTANCE))
+        # (décalage, masque) de chaque bande ; la dernière prend le reste
+        bands = self.max_distance + 1
+        width = 64 // bands
+        self._masks = [
+            (band * width, (1 << (width if band < bands - 1 else 64 - band * width)) - 1)
+            for band in range(bands)
+        ]
+        # Bande -> valeur de la bande -> [(empreinte, emails)]
+        self._bands: List[Dict[int, list]] = [{} for _ in range(bands)]
+        self.skipped = 0
+
+    @classmethod
+    def page_text(cls, html: str) -> str:
+        """Texte approximatif de la page (balises, scripts et styles retirés)"""
+        return cls.STRIP_RE.sub(" ", html).lower()
+
+    @classmethod
+    def simhash(cls, text: str) -> Optional[int]:
+        """Empreinte SimHash des fragments de mots (None si texte trop court)"""
+        words = cls.WORD_RE.findall(text)
+        if len(words) < cls.SHINGLE_SIZE:
+            return None
 
-        # Profils individuels = priorité maximale
-        for pattern in self.compiled_patterns["individual"]:
-            if pattern.search(path):
-                return 9
+        shingles = {
+            " ".join(words[i : i + cls.SHINGLE_SIZE])
+            for i in range(len(words) - cls.SHINGLE_SIZE + 1)
+        }
+        # Vote par bit : les colonnes des empreintes binaires sont comptées en C
+        bits = [
+            format(
+                int.from_bytes(
+                    hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big"
+                ),
+                "064b",
+            )
+            for shingle in shingles
+        ]
+        majority = len(bits) / 2
+        value = 0
+        for column in zip(*bits):
+            value = (value << 1) | (column.count("1") > majority)
+        return value
+
+    def is_duplicate(self, html: str) -> bool:
+        """Vrai si une page quasi identique a déjà été vue ; sinon l'enregistre"""
+        if self.max_distance <= 0:
+            return False
+        text = self.page_text(html)
+        value = self.simhash(text)
+        if value is None:
+            return False
+        emails = frozenset(self.EMAIL_RE.findall(text))
 
-        # Haute priorité
-        for pattern in self.compiled_patterns["high"]:
-            if pattern.search(path):
-                return 10
+        keys = [(value >> shift) & mask for shift, mask in self._masks]
+        for band, key in enumerate(keys):
+            for other, other_emails in self._bands[band].get(key, ()):
+                if (
+                    bin(value ^ other).count("1") <= self.max_distance
+                    and emails <= other_emails
+                ):
+                    self.skipped += 1
+                    return True
 
-        # Moyenne priorité
-        for pattern in self.compiled_patterns["medium"]:
-            if pattern.search(path):
-                return 8
+        for band, key in enumerate(keys):
+            self._bands[band].setdefault(key, []).append((value, emails))
+        return False
 
-        # Basse priorité
-        for pattern in self.compiled_patterns["low"]:
-            if pattern.search(path):
-                return 6
 
-        # URL inconnue = score neutre
-        return 5
+class URLFrontier:
+    """File de priorité des URLs à visiter (tas binaire + index)
 
-    def prioritize_urls(self, urls: list) -> list:
-        """Trie les URLs par ordre de priorité décroissante"""
-        url_scores = [(url, self.score_url(url)) for url in urls]
-        # Trier par score décroissant, puis alphabétiquement pour la cohérence
-        return [url for url, score in sorted(url_scores, key=lambda x: (-x[1], x[0]))]
+    `push` et `pop` sont en O(log n), l'appartenance en O(1). Une URL déjà
+    en file peut voir sa priorité augmentée : l'ancienne entrée du tas est
+    simplement ignorée lorsqu'elle ressort (suppression paresseuse).
 
+    Avec `score_fn`, le score d'une URL est revérifié quand elle arrive en
+    tête : si le rendement appris l'a changé, elle est reclassée au lieu
+    d'être retirée. `keys_fn` indexe les URLs par clé (section, mot) pour
+    que `rescore` ne recalcule que les URLs concernées, jamais toute la file.
+    """
 
-class SimpleScraper:
-    """Scraper simplifié et portable avec ciblage intelligent"""
+    def __init__(self, score_fn=None, keys_fn=None):
+        self._heap: List[Tuple[int, int, str]] = []  # (-score, ordre d'arrivée, url)
+        self._scores: Dict[str, int] = {}  # URL en file -> score courant
+        self._counter = 0
+        self.score_fn = score_fn
+        self.keys_fn = keys_fn
+        self._by_key: Dict[str, set] = {}  # Clé -> URLs en file
 
-    def __init__(self, start_url: str, max_pages: int = 50):
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._scores
+
+    def push(self, url: str, score: int) -> bool:
+        """Ajoute une URL, ou augmente sa priorité si elle est déjà en file"""
+        current = self._scores.get(url)
+        if current is not None and current >= score:
+            return False
+
+        if current is None and self.keys_fn is not None:
+            for key in self.keys_fn(url):
+                self._by_key.setdefault(key, set()).add(url)
+        self.set_score(url, score)
+        return True
+
+    def set_score(self, url: str, score: int):
+        """Fixe le score d'une URL en file (hausse ou baisse)"""
+        self._scores[url] = score
+        heapq.heappush(self._heap, (-score, self._counter, url))
+        self._counter += 1
+
+        # Compacter le tas si les entrées obsolètes s'accumulent
+        if len(self._heap) > 2 * len(self._scores) + 1024:
+            self._heap = [
+                entry for entry in self._heap if self._scores.get(entry[2]) == -entry[0]
+            ]
+            heapq.heapify(self._heap)
+
+    def _top(self) -> Optional[Tuple[int, str]]:
+        """(score, URL) en tête, entrées obsolètes ou périmées traitées"""
+        while self._heap:
+            neg_score, _, url = self._heap[0]
+            if self._scores.get(url) != -neg_score:
+                heapq.heappop(self._heap)
+                continue
+            if self.score_fn is not None:
+                score = self.score_fn(url)
+                if score != -neg_score:
+                    # Rendement appris modifié depuis la mise en file : reclasser
+                    heapq.heappop(self._heap)
+                    self.set_score(url, score)
+                    continue
+            return -neg_score, url
+        return None
+
+    def pop(self) -> Tuple[str, int]:
+        """Retire l'URL la plus prioritaire (à score égal : la plus ancienne)"""
+        top = self._top()
+        if top is None:
+            raise IndexError("pop from empty frontier")
+        heapq.heappop(self._heap)
+        score, url = top
+        del self._scores[url]
+        if self.keys_fn is not None:
+            for key in self.keys_fn(url):
+                urls = self._by_key.get(key)
+                if urls is not None:
+                    urls.discard(url)
+                    if not urls:
+                        del self._by_key[key]
+        return url, score
+
+    def rescore(self, keys: List[str]) -> int:
+        """Recalcule le score des URLs en file liées à ces clés
+
+        Retourne le nombre d'URLs dont le score a changé.
+        """
+        changed = 0
+        urls = set().union(*(self._by_key.get(key, ()) for key in keys))
+        for url in urls:
+            score = self.score_fn(url)
+            if score != self._scores[url]:
+                self.set_score(url, score)
+                changed += 1
+        return changed
+
+    def items(self) -> List[Tuple[str, int]]:
+        """URLs en file avec leur score (pour les checkpoints)"""
+        return list(self._scores.items())
+
+    def peek_score(self) -> Optional[int]:
+        """Score de la prochaine URL, sans la retirer"""
+        top = self._top()
+        return top[0] if top else None
+
+
+# En-têtes HTTP communs à toutes les requêtes
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+
+def accepted_encodings() -> str:
+    """Encodages de compression supportés (brotli seulement si décodable)"""
+    encodings = ["gzip", "deflate"]
+    if any(importlib.util.find_spec(m) for m in ("brotli", "brotlicffi")):
+        encodings.append("br")
+    return ", ".join(encodings)
+
+
+class HostRateLimiter:
+    """Limiteur de débit par hôte (token bucket)
+
+    Chaque hôte dispose d'un budget de `requests_per_second` requêtes par
+    seconde, avec au plus `burst` requêtes consécutives sans attente. Les
+    réservations sont faites à l'avance : plusieurs tâches concurrentes
+    obtiennent chacune leur créneau, sans jamais dépasser le débit.
+    """
+
+    def __init__(self, requests_per_second: float = 1.0, burst: int = 1):
+        self.rate = max(0.01, float(requests_per_second))
+        self.burst = max(1, int(burst))
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # hôte -> (jetons, horodatage)
+        self._limits: Dict[str, Tuple[float, int]] = {}  # hôte -> (débit, rafale)
+        self._lock = threading.Lock()
+
+    def set_crawl_delay(self, host: str, delay: float):
+        """Applique un Crawl-delay (robots.txt) : jamais plus rapide qu'avant"""
+        if delay > 0:
+            self._limits[host] = (min(self.rate, 1.0 / delay), 1)
+
+    def reserve(self, host: str) -> float:
+        """Réserve un créneau pour l'hôte et retourne le délai d'attente (secondes)"""
+        with self._lock:
+            rate, burst = self._limits.get(host, (self.rate, self.burst))
+            now = time.monotonic()
+            tokens, last = self._buckets.get(host, (float(burst), now))
+            tokens = min(float(burst), tokens + (now - last) * rate)
+            tokens -= 1.0
+            self._buckets[host] = (tokens, now)
+
+        # Jetons négatifs = créneau réservé dans le futur
+        return 0.0 if tokens >= 0 else -tokens / rate
+
+    def wait(self, host: str):
+        """Attente bloquante (mode synchrone)"""
+        delay = self.reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire(self, host: str):
+        """Attente non bloquante (mode asyncio)"""
+        delay = self.reserve(host)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class HTTPResponseCache:
+    """Cache HTTP persistant (SQLite) avec revalidation conditionnelle
+
+    Pour chaque URL : corps, en-têtes et date de récupération. Lors d'un
+    nouveau passage, les en-têtes `If-None-Match` / `If-Modified-Since` sont
+    envoyés ; sur une réponse 304 le corps stocké est réutilisé.
+    Éviction : entrées plus vieilles que `max_age_days`, puis les moins
+    récemment utilisées tant que la taille dépasse `max_size_mb`.
+    """
+
+    EVICTION_CHECK_EVERY = 50  # Vérifier la taille tous les N enregistrements
+
+    def __init__(self, path: str, max_size_mb: float = 200, max_age_days: float = 30):
+        self.path = path
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.max_age = max_age_days * 86400
+        self.revalidated = 0  # Réponses 304 servies depuis le cache
+        self._stores = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    body TEXT NOT NULL,
+                    headers TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, url: str) -> Optional[dict]:
+        """Retourne l'entrée en cache pour une URL (None si absente ou expirée)"""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT body, headers, etag, last_modified, fetched_at FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            if time.time() - row[4] > self.max_age:
+                conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                conn.commit()
+                return None
+
+        return {
+            "body": row[0],
+            "headers": json.loads(row[1]),
+            "etag": row[2],
+            "last_modified": row[3],
+            "fetched_at": row[4],
+        }
+
+    @staticmethod
+    def conditional_headers(entry: Optional[dict]) -> Dict[str, str]:
+        """En-têtes de revalidation pour une entrée en cache"""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, body: str, headers) -> None:
+        """Enregistre une réponse 200 (seulement si elle est revalidable)"""
+        headers = {k.lower(): v for k, v in dict(headers).items()}
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+
+        kept = {
+            k: headers[k]
+            for k in ("content-type", "etag", "last-modified")
+            if k in headers
+        }
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    body,
+                    json.dumps(kept),
+                    etag,
+                    last_modified,
+                    now,
+                    now,
+                    len(body.encode("utf-8", "replace")),
+                ),
+            )
+            conn.commit()
+
+            self._stores += 1
+            if self._stores % self.EVICTION_CHECK_EVERY == 0:
+                self._evict(conn)
+
+    def touch(self, url: str) -> None:
+        """Marque une entrée comme revalidée (réponse 304)"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url),
+            )
+            conn.commit()
+            self.revalidated += 1
+
+    def _evict(self, conn):
+        """Supprime les entrées expirées puis les moins récemment utilisées"""
+        conn.execute(
+            "DELETE FROM responses WHERE fetched_at < ?", (time.time() - self.max_age,)
+        )
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > self.max_size:
+            # Redescendre à 90% de la limite pour ne pas évincer à chaque ajout
+            to_free = total - int(self.max_size * 0.9)
+            freed = 0
+            victims = []
+            for url, size in conn.execute(
+                "SELECT url, size FROM responses ORDER BY accessed_at"
+            ):
+                if freed >= to_free:
+                    break
+                victims.append((url,))
+                freed += size
+            conn.executemany("DELETE FROM responses WHERE url = ?", victims)
+        conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Version de l'analyse des pages (langue, personnes, liens) : à incrémenter
+# à chaque changement de l'extraction pour invalider les résultats stockés
+EXTRACTION_VERSION = 2
+
+
+class ContentFingerprintStore:
+    """Empreintes de contenu par URL pour les re-crawls incrémentaux
+
+    Associe à chaque URL l'empreinte de son HTML normalisé et les résultats
+    obtenus (langue, personnes, liens). Si l'empreinte n'a pas changé, ces
+    résultats sont réutilisés sans parser ni ré-extraire la page. Les
+    résultats d'une autre version de l'extraction sont effacés à l'ouverture.
+    """
+
+    # Parties du HTML qui changent sans que le contenu change
+    _VOLATILE_RE = re.compile(
+        r"<script\b.*?</script>|<style\b.*?</style>|<!--.*?-->", re.I | re.S
+    )
+    _WHITESPACE_RE = re.compile(r"\s+")
+
+    def __init__(self, path: str, version: int = EXTRACTION_VERSION):
+        self.path = path
+        self.version = version
+        self.reused = 0  # Pages dont l'extraction a été évitée
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    supported INTEGER NOT NULL,
+                    persons TEXT NOT NULL,
+                    links TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            # Version de l'extraction dans l'en-tête SQLite (user_version)
+            stored = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if stored != self.version:
+                self._conn.execute("DELETE FROM pages")
+                self._conn.execute(f"PRAGMA user_version = {int(self.version)}")
+            self._conn.commit()
+        return self._conn
+
+    @classmethod
+    def fingerprint(cls, html: str) -> str:
+        """Empreinte du HTML normalisé (scripts, styles et commentaires exclus)"""
+        normalized = cls._VOLATILE_RE.sub(" ", html)
+        normalized = cls._WHITESPACE_RE.sub(" ", normalized).strip()
+        return hashlib.sha1(normalized.encode("utf-8", "replace")).hexdigest()
+
+    def lookup(
+        self, url: str, fingerprint: str
+    ) -> Optional[Tuple[bool, List[PersonInfo], List[str]]]:
+        """Résultats précédents si la page n'a pas changé, sinon None"""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT fingerprint, supported, persons, links FROM pages WHERE url = ?",
+                    (url,),
+                )
+                .fetchone()
+            )
+        if row is None or row[0] != fingerprint:
+            return None
+
+        self.reused += 1
+        persons = [PersonInfo(**data) for data in json.loads(row[2])]
+        return bool(row[1]), persons, json.loads(row[3])
+
+    def save(
+        self,
+        url: str,
+        fingerprint: str,
+        supported: bool,
+        persons: List[PersonInfo],
+        links: List[str],
+    ):
+        """Enregistre les résultats d'une page pour le prochain passage"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    fingerprint,
+                    int(supported),
+                    json.dumps([asdict(p) for p in persons], ensure_ascii=False),
+                    json.dumps(links),
+                    time.time(),
+                ),
+            )
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CrawlCheckpoint:
+    """Fichier d'état compact (JSON gzip) pour reprendre un crawling interrompu"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def save(self, state: dict):
+        """Écrit l'état de manière atomique (jamais de fichier à moitié écrit)"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        state = dict(state, saved_at=datetime.now().isoformat())
+        tmp_path = self.path + ".tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> Optional[dict]:
+        """Lit le dernier état sauvegardé (None si absent ou illisible)"""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Checkpoint illisible {self.path}: {e}")
+            return None
+
+    def remove(self):
+        """Supprime le checkpoint (crawling terminé normalement)"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class SiteDiscovery:
+    """Découverte des pages d'un site avant le crawling
+
+    Lit robots.txt (entrées Sitemap, Crawl-delay) puis les sitemaps, index
+    de sitemaps compris, compressés en gzip ou non. Les sitemaps sont lus
+    en flux (iterparse) : même un fichier de plusieurs centaines de Mo
+    n'est jamais chargé entièrement en mémoire.
+    """
+
+    MAX_SITEMAPS = 25  # Sitemaps lus au maximum (index compris)
+    MAX_URLS = 50_000  # URLs retenues au maximum
+
+    def __init__(self, session, timeout=(5.0, 10.0), throttle=None):
+        self.session = session
+        self.timeout = timeout
+        # Appelé avant chaque requête (politesse : limiteur de débit)
+        self.throttle = throttle
+
+    def fetch(self, url: str):
+        """Requête en flux ; None si la ressource est absente"""
+        if self.throttle:
+            self.throttle(url)
+        try:
+            response = self.session.get(url, timeout=self.timeout, stream=True)
+        except Exception as e:
+            logger.debug(f"Erreur récupération {url}: {e}")
+            return None
+        if response.status_code != 200:
+            response.close()
+            return None
+        return response
+
+    def read_robots(self, origin: str) -> Tuple[List[str], Optional[float]]:
+        """Sitemaps déclarés et Crawl-delay (pour tous les robots) de robots.txt"""
+        response = self.fetch(origin + "/robots.txt")
+        if response is None:
+            return [], None
+
+        sitemaps = []
+        crawl_delay = None
+        applies_to_us = False
+        in_agents = False
+        try:
+            for raw_line in response.iter_lines(decode_unicode=True):
+                line = (raw_line or "").split("#", 1)[0].strip()
+                if ":" not in line:
+                    continue
+                field, value = line.split(":", 1)
+                field = field.strip().lower()
+                value = value.strip()
+
+                if field == "sitemap":
+                    # Valable quel que soit le groupe User-agent
+                    sitemaps.append(urljoin(origin + "/", value))
+                elif field == "user-agent":
+                    # Plusieurs User-agent consécutifs forment un même groupe
+                    if not in_agents:
+                        applies_to_us = False
+                    applies_to_us = applies_to_us or value == "*"
+                    in_agents = True
+                    continue
+                elif field == "crawl-delay" and applies_to_us:
+                    try:
+                        crawl_delay = float(value)
+                    except ValueError:
+                        pass
+                in_agents = False
+        except Exception as e:
+            logger.debug(f"Erreur lecture robots.txt: {e}")
+        finally:
+            response.close()
+        return sitemaps, crawl_delay
+
+    def iter_urls(self, sitemap_urls: List[str]):
+        """URLs de pages trouvées dans les sitemaps (index suivis en largeur)"""
+        queue = list(sitemap_urls)
+        seen = set(queue)
+        read = 0
+        found = 0
+        while queue and read < self.MAX_SITEMAPS:
+            sitemap_url = queue.pop(0)
+            read += 1
+            for kind, loc in self.parse_sitemap(sitemap_url):
+                if kind == "sitemap":
+                    if loc not in seen:
+                        seen.add(loc)
+                        queue.append(loc)
+                else:
+                    yield loc
+                    found += 1
+                    if found >= self.MAX_URLS:
+                        return
+
+    def parse_sitemap(self, url: str):
+        """Entrées ("sitemap" | "url", adresse) d'un sitemap, lu en flux"""
+        import xml.etree.ElementTree as ET
+
+        response = self.fetch(url)
+        if response is None:
+            return
+        try:
+            stream = response.raw
+            # Content-Encoding éventuel décodé par urllib3
+            stream.decode_content = True
+            head = stream.read(2)
+            stream = PrefixedStream(head, stream)
+            if head == b"\x1f\x8b":
+                # Fichier .xml.gz servi tel quel
+                stream = gzip.GzipFile(fileobj=stream)
+
+            loc = None
+            for _, elem in ET.iterparse(stream, events=("end",)):
+                tag = elem.tag.rsplit("}", 1)[-1]
+                if tag == "loc":
+                    loc = (elem.text or "").strip()
+                elif tag in ("url", "sitemap"):
+                    if loc:
+                        yield tag, loc
+                    loc = None
+                    # Libérer la mémoire au fil de la lecture
+                    elem.clear()
+        except Exception as e:
+            logger.debug(f"Erreur lecture sitemap {url}: {e}")
+        finally:
+            response.close()
+
+
+class PrefixedStream:
+    """Flux binaire dont les premiers octets ont déjà été lus"""
+
+    def __init__(self, prefix: bytes, stream):
+        self.prefix = prefix
+        self.stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        if not self.prefix:
+            return self.stream.read(size)
+        if size is None or size < 0:
+            data, self.prefix = self.prefix + self.stream.read(), b""
+            return data
+        data, self.prefix = self.prefix[:size], self.prefix[size:]
+        if len(data) < size:
+            data += self.stream.read(size - len(data))
+        return data
+
+
+def person_profile_score(person: PersonInfo) -> float:
+    """Qualité d'un profil, pour garder le meilleur parmi plusieurs doublons"""
+    score = person.confidence
+    # Bonus si nom valide (pas vide, pas "Optionnel Formats", etc.)
+    if person.nom and len(person.nom) > 3 and " " in person.nom:
+        score += 0.5
+    # Bonus si téléphone présent
+    if person.telephone:
+        score += 0.2
+    return score
+
+
+class EmailDedupIndex:
+    """Index de déduplication par email, borné en mémoire (LRU)
+
+    Retient pour chaque email le score du meilleur profil déjà émis. Au-delà
+    de `max_entries` emails, les moins récemment vus sont oubliés.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max(1, int(max_entries))
+        self._scores: "OrderedDict[str, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def offer(self, person: PersonInfo) -> Optional[str]:
+        """"new" (email inconnu), "better" (profil amélioré) ou None (doublon)"""
+        if not person.email:
+            return None
+
+        key = person.email.lower()
+        score = person_profile_score(person)
+        previous = self._scores.get(key)
+        if previous is not None:
+            self._scores.move_to_end(key)
+            if score <= previous:
+                return None
+
+        self._scores[key] = score
+        if len(self._scores) > self.max_entries:
+            self._scores.popitem(last=False)
+        return "new" if previous is None else "better"
+
+    def items(self) -> List[Tuple[str, float]]:
+        return list(self._scores.items())
+
+    def update(self, items):
+        for key, score in items:
+            self._scores[key] = score
+
+
+class ResultSink:
+    """Destination des résultats, alimentée au fil du crawling"""
+
+    def write(self, person: PersonInfo):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MemorySink(ResultSink):
+    """Garde les résultats en mémoire (comportement historique de crawl)"""
+
+    def __init__(self):
+        self.persons: List[PersonInfo] = []
+
+    def write(self, person: PersonInfo):
+        self.persons.append(person)
+
+
+class JSONLinesSink(ResultSink):
+    """Écrit une personne par ligne (JSON Lines), visible immédiatement"""
+
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        self.count = 0
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, person: PersonInfo):
+        line = json.dumps(asdict(person), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class JSONFileSink(ResultSink):
+    """Fichier JSON indenté habituel, construit à la fin depuis le JSON Lines
+
+    Seuls l'email, le score et la position de chaque ligne sont gardés en
+    mémoire : le meilleur profil par email est relu depuis le disque.
+    """
+
+    def __init__(self, path: str, source: JSONLinesSink):
+        self.path = path
+        self.source = source
+        self.count = 0
+        self.preview: List[PersonInfo] = []  # Meilleurs profils (affichage)
+
+    def write(self, person: PersonInfo):
+        pass  # Les données passent par le fichier JSON Lines
+
+    def close(self):
+        self.source.close()
+
+        best: Dict[str, Tuple[float, float, int]] = {}  # email -> (score, confiance, offset)
+        with open(self.source.path, "rb") as f:
+            offset = 0
+            for raw in f:
+                try:
+                    person = PersonInfo(**json.loads(raw))
+                except (ValueError, TypeError):
+                    offset += len(raw)
+                    continue
+                key = person.email.lower()
+                score = person_profile_score(person)
+                if key not in best or score > best[key][0]:
+                    best[key] = (score, person.confidence, offset)
+                offset += len(raw)
+
+        # Même ordre que deduplicate_persons : confiance décroissante
+        ordered = sorted(best.values(), key=lambda entry: entry[1], reverse=True)
+        with open(self.source.path, "rb") as src, open(
+            self.path, "w", encoding="utf-8"
+        ) as out:
+            out.write("[")
+            for i, (_, _, offset) in enumerate(ordered):
+                src.seek(offset)
+                record = json.loads(src.readline())
+                if i < 3:
+                    self.preview.append(PersonInfo(**record))
+                text = json.dumps(record, ensure_ascii=False, indent=2)
+                out.write(("," if i else "") + "\n  " + text.replace("\n", "\n  "))
+            out.write("\n]" if ordered else "]")
+        self.count = len(ordered)
+
+
+class SupabaseSink(ResultSink):
+    """Envoie les résultats par lots vers Supabase pendant le crawling"""
+
+    def __init__(self, db: SimpleSupabaseManager):
+        self.db = db
+        self.saved = 0
+
+    def write(self, person: PersonInfo):
+        self.saved += self.db.add(person)
+
+    def close(self):
+        self.saved += self.db.flush()
+
+
+class SimpleScraper:
+    """Scraper simplifié et portable avec ciblage intelligent"""
+
+    def __init__(
+        self,
+        start_url: str,
+        max_pages: int = 50,
+        concurrency: int = 1,
+        requests_per_second: float = 1.0,
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 10.0,
+        cache: Optional[HTTPResponseCache] = None,
+        fingerprints: Optional[ContentFingerprintStore] = None,
+        checkpoint: Optional[CrawlCheckpoint] = None,
+        checkpoint_every: int = 10,
+        resume: bool = False,
+        extractor: Optional[IntelligentPersonExtractor] = None,
+        extraction_pool=None,
+        sinks: Optional[List[ResultSink]] = None,
+        dedup_max_entries: int = 100_000,
+        checkpoint_metadata: Optional[dict] = None,
+        discover: bool = True,
+        yield_stats: Optional[URLYieldStats] = None,
+        idle_pages_limit: int = 30,
+        min_frontier_score: int = 8,
+        canonicalizer: Optional[URLCanonicalizer] = None,
+        near_duplicate_distance: int = 3,
+        stop_event: Optional[threading.Event] = None,
+    ):
         self.start_url = start_url
+        # Arrêt demandé depuis un autre thread (Ctrl-C en mode batch)
+        self.stop_event = stop_event
         self.max_pages = max_pages
-        self.domain = urlparse(start_url).netloc
+        # Une page = une URL (paramètres de suivi, casse de l'hôte, "/" final...)
+        # La forme canonique sert de clé (file, pages visitées) ; la page est
+        # récupérée à l'adresse d'origine, qui peut différer (ex: "/equipe/")
+        self.canonicalizer = canonicalizer or URLCanonicalizer()
+        self.domain = urlparse(self.canonicalizer.canonicalize(start_url)).netloc
+        self.fetch_urls: Dict[str, str] = {}  # Clé canonique -> URL d'origine
+        # Pages quasi identiques (tri, pagination vide...) non ré-analysées
+        self.near_duplicates = NearDuplicateIndex(near_duplicate_distance)
         self.visited: set[str] = set()
-        self.extractor = IntelligentPersonExtractor()
-        self.prioritizer = SmartURLPrioritizer()
+        # Extracteur partageable entre plusieurs scrapers (mode batch)
+        self.extractor = extractor or IntelligentPersonExtractor()
+        # Pool de processus (optionnel) pour paralléliser l'extraction
+        self.extraction_pool = extraction_pool
+
+        # Résultats envoyés au fil de l'eau (fichiers, base...) plutôt
+        # qu'accumulés ; sans sink, on garde l'ancien comportement en mémoire
+        self.memory_sink = None if sinks else MemorySink()
+        self.sinks: List[ResultSink] = list(sinks) if sinks else [self.memory_sink]
+        self.dedup = EmailDedupIndex(dedup_max_entries)
+        self.persons_found = 0  # Personnes uniques (par email) trouvées
+        # Informations à conserver dans le checkpoint (ex: fichiers de sortie)
+        self.checkpoint_metadata = checkpoint_metadata or {}
+        # Priorisation des URLs, ajustée par le rendement observé du site
+        self.prioritizer = SmartURLPrioritizer(yield_stats)
         self.results: list[PersonInfo] = []
-        self.successful_patterns: set[str] = (
-            set()
-        )  # Patterns qui ont donné des résultats
+
+        # Nombre de requêtes simultanées (1 = mode synchrone classique)
+        self.concurrency = max(1, int(concurrency))
+        # Politesse : débit maximum par hôte, indépendant de la concurrence
+        self.rate_limiter = HostRateLimiter(
+            requests_per_second, burst=min(self.concurrency, 2)
+        )
+
+        # Session HTTP persistante (keep-alive, pool de connexions)
+        self.pool_size = max(1, int(pool_size), self.concurrency)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._session = None
+
+        # Cache HTTP persistant (optionnel) pour les re-crawls
+        self.cache = cache
+        # Empreintes de contenu (optionnel) : pas de ré-extraction si inchangé
+        self.fingerprints = fingerprints
+
+        # Checkpoints périodiques pour reprendre un crawling interrompu
+        self.checkpoint = checkpoint
+        self.checkpoint_every = max(1, int(checkpoint_every))
+        self.resume = resume
+        self.in_progress: Dict[str, int] = {}  # Pages en cours -> score
+        self.pages_since_checkpoint = 0
+
+        # Découverte robots.txt / sitemaps avant le crawling
+        self.discover = discover
+
+        # Arrêt anticipé : `idle_pages_limit` pages sans nouvelle personne et
+        # plus aucune URL en file avec un score >= `min_frontier_score`
+        # (0 = désactivé)
+        self.idle_pages_limit = max(0, int(idle_pages_limit))
+        self.min_frontier_score = min_frontier_score
+        self.pages_done = 0
+        self.last_new_person_page = 0
+        self.stopped_early = False
+
+    def get_session(self):
+        """Retourne la session HTTP du scraper (créée à la première requête)"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=self.pool_size, pool_maxsize=self.pool_size
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(DEFAULT_HEADERS)
+            session.headers["Accept-Encoding"] = accepted_encodings()
+            self._session = session
+        return self._session
+
+    def close(self):
+        """Ferme les connexions HTTP ouvertes"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
     def is_valid_url(self, url: str) -> bool:
         """Vérifie si l'URL est valide pour ce scraping"""
@@ -1164,12 +2943,11 @@ class SimpleScraper:
             )
         )
 
-    def is_supported_language(self, html: str) -> bool:
+    def is_supported_language(self, html) -> bool:
         """Vérifie si une page est en français ou anglais (langues supportées)"""
         try:
-            from bs4 import BeautifulSoup
-
-            soup = BeautifulSoup(html, "html.parser")
+            page = ParsedPage.of(html)
+            soup = page.soup
 
             # Vérifier l'attribut lang de la page
             html_tag = soup.find("html")
@@ -1191,7 +2969,7 @@ class SimpleScraper:
                         return True
 
             # Vérifier les indicateurs FR/EN dans le contenu
-            text = soup.get_text().lower()
+            text = page.text_lower
 
             # Indicateurs français
             french_indicators = [
@@ -1215,77 +2993,85 @@ class SimpleScraper:
             logger.debug(f"Erreur détection langue: {e}")
             return True  # Par défaut, on accepte
 
-    def get_page_content(self, url: str) -> Optional[str]:
-        """Récupère le contenu d'une page"""
+    def get_page_content(self, url: str) -> Tuple[Optional[str], str]:
+        """Récupère le contenu d'une page et son URL finale (après redirections)"""
         try:
-            import requests
-
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-
-            response = requests.get(url, headers=headers, timeout=10)
+            cached = self.cache.get(url) if self.cache else None
+            response = self.get_session().get(
+                url,
+                headers=HTTPResponseCache.conditional_headers(cached),
+                timeout=(self.connect_timeout, self.read_timeout),
+            )
+            if response.status_code == 304 and cached:
+                # Page inchangée : réutiliser le corps stocké
+                self.cache.touch(url)
+                return cached["body"], response.url
             if response.status_code == 200:
-                return response.text
+                if self.cache:
+                    self.cache.store(url, response.text, response.headers)
+                return response.text, response.url
         except Exception as e:
             logger.debug(f"Erreur récupération {url}: {e}")
-        return None
+        return None, url
 
-    def extract_links(self, html: str, base_url: str) -> list:
-        """Extrait et priorise les liens d'une page"""
+    async def fetch_page_async(self, session, url: str) -> Tuple[Optional[str], str]:
+        """Comme get_page_content, via une session aiohttp"""
         try:
-            from bs4 import BeautifulSoup
+            cached = self.cache.get(url) if self.cache else None
+            async with session.get(
+                url, headers=HTTPResponseCache.conditional_headers(cached)
+            ) as response:
+                if response.status == 304 and cached:
+                    self.cache.touch(url)
+                    return cached["body"], str(response.url)
+                if response.status == 200:
+                    text = await response.text(errors="replace")
+                    if self.cache:
+                        self.cache.store(url, text, response.headers)
+                    return text, str(response.url)
+        except Exception as e:
+            logger.debug(f"Erreur récupération {url}: {e}")
+        return None, url
 
-            soup = BeautifulSoup(html, "html.parser")
-            links = set()
+    def extract_links(self, html, base_url: str) -> list:
+        """Extrait et priorise les liens d'une page"""
+        try:
+            page = ParsedPage.of(html, base_url)
+            links = {}  # Clé canonique -> URL absolue (résolue sur la page)
 
-            for a in soup.find_all("a", href=True):
-                href_attr = a["href"]
-                if isinstance(href_attr, str):
-                    href = href_attr.strip()
-                    if href and not href.startswith(
-                        ("#", "javascript:", "mailto:", "tel:")
-                    ):
-                        full_url = urljoin(base_url, href)
-                        full_url = full_url.split("#")[0]  # Retirer fragment
-                        if self.is_valid_url(full_url):
-                            links.add(full_url)
+            for href in page.anchors:
+                if href and not href.startswith(
+                    ("#", "javascript:", "mailto:", "tel:")
+                ):
+                    full_url = urldefrag(urljoin(base_url, href))[0]
+                    key = self.canonicalizer.canonicalize(full_url)
+                    if key not in links and self.is_valid_url(key):
+                        links[key] = full_url
 
-            # Prioriser les liens trouvés
-            prioritized_links = self.prioritizer.prioritize_urls(list(links))
+            # Prioriser les liens trouvés (chaque lien n'est scoré qu'une fois)
+            scored_links = self.prioritizer.score_urls(list(links))
 
             # Afficher les liens prioritaires pour debug
-            if prioritized_links:
-                high_priority = [
-                    url
-                    for url in prioritized_links
-                    if self.prioritizer.score_url(url) >= 8
-                ]
-                if high_priority:
-                    print(
-                        f"   🎯 {len(high_priority)} lien(s) prioritaire(s) trouvé(s)"
-                    )
+            high_priority = sum(1 for _, score in scored_links if score >= 8)
+            if high_priority:
+                print(f"   🎯 {high_priority} lien(s) prioritaire(s) trouvé(s)")
 
-            return prioritized_links
+            return [links[key] for key, _ in scored_links]
         except Exception:
             return []
 
-    def extract_persons_from_page(self, html: str, url: str) -> List[PersonInfo]:
+    def extract_persons_from_page(self, html, url: str) -> List[PersonInfo]:
         """Extrait les personnes d'une page avec analyse intelligente"""
         try:
-            from bs4 import BeautifulSoup
-
-            soup = BeautifulSoup(html, "html.parser")
+            soup = ParsedPage.of(html, url).soup
 
             # 1. Identifier les zones de profils potentielles
             profile_zones = self.extractor.identify_profile_zones(soup)
             all_persons = []
 
-            # 2. Traiter chaque zone séparément
-            for zone in profile_zones:
-                # Extraire les éléments avec leur position
-                elements = self.extractor.extract_elements_with_position(zone)
-
+            # 2. Traiter chaque zone séparément (NER groupée sur la page)
+            zones_elements = self.extractor.extract_zones_elements(profile_zones)
+            for elements in zones_elements:
                 if not elements:
                     continue
 
@@ -1326,119 +3112,667 @@ class SimpleScraper:
         unique_persons = []
         for email, profiles in by_email.items():
             # Scorer chaque profil
-            def profile_score(p):
-                score = p.confidence
-                # Bonus si nom valide (pas vide, pas "Optionnel Formats", etc.)
-                if p.nom and len(p.nom) > 3 and " " in p.nom:
-                    score += 0.5
-                # Bonus si téléphone présent
-                if p.telephone:
-                    score += 0.2
-                return score
-
-            best = max(profiles, key=profile_score)
+            best = max(profiles, key=person_profile_score)
             unique_persons.append(best)
 
         return sorted(unique_persons, key=lambda p: p.confidence, reverse=True)
 
     def crawl(self) -> List[PersonInfo]:
-        """Lance le crawling avec priorisation intelligente"""
-        print(f"🕷️  Début du crawling intelligent de {self.start_url}")
+        """Lance le crawling avec priorisation intelligente
 
-        # Utiliser une liste prioritaire au lieu d'une FIFO simple
-        to_visit = []
-        all_persons = []
+        Les personnes sont envoyées aux sinks dès qu'elles sont trouvées. Sans
+        sink, elles sont gardées en mémoire et retournées à la fin.
+        """
+        mode = (
+            f" ({self.concurrency} requêtes simultanées)" if self.concurrency > 1 else ""
+        )
+        print(f"🕷️  Début du crawling intelligent de {self.start_url}{mode}")
 
-        # Ajouter l'URL de départ avec sa priorité
-        initial_score = self.prioritizer.score_url(self.start_url)
-        to_visit.append((self.start_url, initial_score))
-        print(f"🎯 URL de départ (score: {initial_score}): {self.start_url}")
+        # Utiliser une file prioritaire au lieu d'une FIFO simple
+        # Scores revérifiés en tête de file, sections indexées pour le rescoring
+        to_visit = URLFrontier(
+            self.prioritizer.priority, self.prioritizer.yield_stats.features
+        )
 
-        while to_visit and len(self.visited) < self.max_pages:
-            # Trier par priorité décroissante et prendre la meilleure
-            to_visit.sort(key=lambda x: x[1], reverse=True)
-            url, score = to_visit.pop(0)
+        resumed = self.resume and self.load_checkpoint(to_visit)
+        if not resumed:
+            # Ajouter l'URL de départ avec sa priorité
+            initial_score = self.enqueue(to_visit, self.start_url)
+            print(f"🎯 URL de départ (score: {initial_score}): {self.start_url}")
 
-            if url in self.visited:
-                continue
+        if self.discover:
+            # Après une reprise, la file contient déjà les pages du sitemap
+            self.discover_pages(to_visit, seed=not resumed)
 
-            self.visited.add(url)
-            score_emoji = "🔥" if score >= 9 else "⭐" if score >= 8 else "📄"
+        try:
+            if self.concurrency > 1 or self.extraction_pool is not None:
+                asyncio.run(self.crawl_async(to_visit))
+            else:
+                self.crawl_sync(to_visit)
+        except BaseException:
+            # Ctrl-C, crash, coupure réseau : garder la progression
+            if self.checkpoint:
+                self.save_checkpoint(to_visit)
+                print("\n💾 Progression sauvegardée, relancez avec --resume pour reprendre")
+            raise
+
+        if self.stop_requested:
+            # Pages en cours terminées : la suite reprendra avec --resume
+            if self.checkpoint:
+                self.save_checkpoint(to_visit)
+                print(
+                    f"\n💾 {self.start_url} : progression sauvegardée, "
+                    f"relancez avec --resume pour reprendre"
+                )
+            return self.finish_crawl()
+
+        if self.checkpoint:
+            self.checkpoint.remove()
+        return self.finish_crawl()
+
+    def discover_pages(self, to_visit: URLFrontier, seed: bool = True):
+        """robots.txt (Crawl-delay) puis sitemaps pour amorcer la file"""
+        parsed = urlparse(self.start_url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        discovery = SiteDiscovery(
+            self.get_session(),
+            timeout=(self.connect_timeout, self.read_timeout),
+            throttle=lambda url: self.rate_limiter.wait(urlparse(url).netloc),
+        )
+
+        sitemaps, crawl_delay = discovery.read_robots(origin)
+        if crawl_delay:
+            self.rate_limiter.set_crawl_delay(self.domain, crawl_delay)
+            print(f"🤖 robots.txt : Crawl-delay de {crawl_delay:g}s respecté")
+        if not seed:
+            return
+
+        added = 0
+        high_priority = 0
+        for url in discovery.iter_urls(sitemaps or [origin + "/sitemap.xml"]):
+            score = self.enqueue(to_visit, urldefrag(url)[0])
+            if score is not None:
+                added += 1
+                if score >= 8:
+                    high_priority += 1
+
+        if added:
             print(
-                f"{score_emoji} Page {len(self.visited)}/{self.max_pages} (score:{score}): {url}"
+                f"🗺️  Sitemap : {added} page(s) ajoutée(s), "
+                f"dont {high_priority} prioritaire(s)"
             )
 
-            # Récupérer le contenu
-            html = self.get_page_content(url)
-            if not html:
-                continue
+    def enqueue(self, to_visit: URLFrontier, url: str) -> Optional[int]:
+        """Met une URL en file sous sa forme canonique
 
-            # Vérifier si la page est dans une langue supportée (FR/EN)
-            if not self.is_supported_language(html):
-                print(f"   🚫 Langue non supportée, ignorée")
+        Retourne son score si elle a été ajoutée (ou remontée), None sinon.
+        """
+        key = self.canonicalizer.canonicalize(url)
+        if key in self.visited or not self.is_valid_url(key):
+            return None
+        # Score de base + bonus appris des pages déjà visitées
+        score = self.prioritizer.priority(key)
+        # Une URL déjà en file est remontée si son score augmente
+        if not to_visit.push(key, score):
+            return None
+        if key != url:
+            self.fetch_urls.setdefault(key, url)
+        return score
+
+    @property
+    def stop_requested(self) -> bool:
+        """Vrai si l'arrêt du crawling a été demandé"""
+        return self.stop_event is not None and self.stop_event.is_set()
+
+    @property
+    def idle_pages(self) -> int:
+        """Pages terminées depuis la dernière nouvelle personne"""
+        return self.pages_done - self.last_new_person_page
+
+    def should_stop_early(self, to_visit: URLFrontier) -> bool:
+        """Rendement épuisé : plus de nouveaux contacts ni de page prometteuse"""
+        if not self.idle_pages_limit or self.idle_pages < self.idle_pages_limit:
+            return False
+        best_score = to_visit.peek_score()
+        if best_score is not None and best_score >= self.min_frontier_score:
+            return False
+
+        if not self.stopped_early:
+            self.stopped_early = True
+            print(
+                f"\n⏹️  Arrêt anticipé : {self.idle_pages} page(s) sans nouveau "
+                f"contact et plus de page prometteuse en file"
+            )
+        return True
+
+    def crawl_sync(self, to_visit: URLFrontier):
+        """Boucle de crawling séquentielle (une page à la fois)"""
+        while (
+            to_visit
+            and len(self.visited) < self.max_pages
+            and not self.stop_requested
+            and not self.should_stop_early(to_visit)
+        ):
+            url, score = to_visit.pop()
+
+            if url in self.visited:
                 continue
 
-            # Extraire les personnes
-            persons = self.extract_persons_from_page(html, url)
-            all_persons.extend(persons)
-
-            if persons:
-                print(f"   👥 {len(persons)} personne(s) trouvée(s)")
-                # Enregistrer le pattern comme réussi
-                self.track_successful_pattern(url)
-
-                for person in persons:
-                    confidence_str = f"({person.confidence:.1f})"
-                    name_str = person.nom or "❓"
-                    phone_str = person.telephone or "❓"
-                    print(
-                        f"      • {name_str} - {person.email} - {phone_str} {confidence_str}"
+            self.start_page(url, score)
+
+            # Pause respectueuse (budget par hôte)
+            self.rate_limiter.wait(urlparse(url).netloc)
+
+            # Récupérer le contenu (adresse d'origine, redirections suivies)
+            html, page_url = self.get_page_content(self.fetch_urls.get(url, url))
+            if html:
+                self.process_page(url, html, to_visit, page_url)
+            self.finish_page(url, to_visit)
+
+    async def crawl_async(self, to_visit: URLFrontier):
+        """Crawling concurrent (asyncio) avec budget de politesse par hôte
+
+        `concurrency` pages sont récupérées en parallèle ; chaque tâche prend
+        toujours l'URL la plus prioritaire restante, et le limiteur de débit
+        garantit le même rythme de requêtes vers le site qu'en mode classique.
+        """
+        import aiohttp
+
+        # Les tâches en cours peuvent encore découvrir des liens : on attend
+        # qu'elles aient terminé avant de conclure que la file est vide
+        in_flight = 0
+        changed = asyncio.Condition()
+
+        async def worker(session):
+            nonlocal in_flight
+            while True:
+                async with changed:
+                    while not to_visit and in_flight > 0:
+                        await changed.wait()
+                    if (
+                        not to_visit
+                        or len(self.visited) >= self.max_pages
+                        or self.stop_requested
+                        or self.should_stop_early(to_visit)
+                    ):
+                        changed.notify_all()
+                        return
+
+                    url, score = to_visit.pop()
+                    if url in self.visited:
+                        continue
+
+                    self.start_page(url, score)
+                    in_flight += 1
+
+                try:
+                    await self.rate_limiter.acquire(urlparse(url).netloc)
+                    html, page_url = await self.fetch_page_async(
+                        session, self.fetch_urls.get(url, url)
                     )
+                    if html:
+                        await self.process_page_async(url, html, to_visit, page_url)
+                    self.finish_page(url, to_visit)
+                finally:
+                    async with changed:
+                        in_flight -= 1
+                        changed.notify_all()
+
+        timeout = aiohttp.ClientTimeout(
+            sock_connect=self.connect_timeout, sock_read=self.read_timeout
+        )
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_size, limit_per_host=self.concurrency
+        )
+        headers = dict(DEFAULT_HEADERS, **{"Accept-Encoding": accepted_encodings()})
+        async with aiohttp.ClientSession(
+            headers=headers, timeout=timeout, connector=connector
+        ) as session:
+            await asyncio.gather(*(worker(session) for _ in range(self.concurrency)))
+
+    def start_page(self, url: str, score: int):
+        """Marque une page comme visitée et en cours de traitement"""
+        self.visited.add(url)
+        self.in_progress[url] = score
+        self.print_page_header(url, score)
+
+    def finish_page(self, url: str, to_visit: URLFrontier):
+        """Fin du traitement d'une page (checkpoint périodique)"""
+        self.in_progress.pop(url, None)
+        self.fetch_urls.pop(url, None)
+        self.pages_done += 1
+        self.pages_since_checkpoint += 1
+        if self.pages_since_checkpoint >= self.checkpoint_every:
+            self.save_checkpoint(to_visit)
+
+    def save_checkpoint(self, to_visit: URLFrontier):
+        """Sauvegarde l'état du crawling (file, pages visitées, résultats)"""
+        if not self.checkpoint:
+            return
+        self.pages_since_checkpoint = 0
+
+        # Les pages interrompues en cours de traitement seront refaites
+        frontier = to_visit.items() + list(self.in_progress.items())
+        visited = [url for url in self.visited if url not in self.in_progress]
 
-            # Découvrir de nouveaux liens avec priorisation
-            if len(self.visited) < self.max_pages:
-                links = self.extract_links(html, url)
-                for link in links:
-                    if link not in self.visited and not any(
-                        l[0] == link for l in to_visit
-                    ):
-                        link_score = self.prioritizer.score_url(link)
-                        # Bonus si c'est un pattern qui a déjà donné des résultats
-                        if self.matches_successful_pattern(link):
-                            link_score += 2
-                        to_visit.append((link, link_score))
+        try:
+            self.checkpoint.save(
+                {
+                    "start_url": self.start_url,
+                    "frontier": frontier,
+                    "visited": visited,
+                    "fetch_urls": self.fetch_urls,
+                    "dedup": self.dedup.items(),
+                    "persons": [asdict(p) for p in self.memory_sink.persons]
+                    if self.memory_sink
+                    else [],
+                    **self.checkpoint_metadata,
+                }
+            )
+        except OSError as e:
+            logger.warning(f"Checkpoint impossible: {e}")
+        self.prioritizer.yield_stats.save()
+
+    def load_checkpoint(self, to_visit: URLFrontier) -> bool:
+        """Reprend un crawling interrompu depuis le dernier checkpoint"""
+        state = self.checkpoint.load() if self.checkpoint else None
+        if not state:
+            print("ℹ️  Aucun checkpoint à reprendre, nouveau crawling")
+            return False
+        if state.get("start_url") != self.start_url:
+            print("⚠️  Checkpoint d'une autre URL de départ, ignoré")
+            return False
+
+        self.visited.update(state["visited"])
+        self.fetch_urls.update(state.get("fetch_urls", {}))
+        self.dedup.update(state.get("dedup", []))
+        self.persons_found = len(self.dedup)
+        if self.memory_sink:
+            self.memory_sink.persons.extend(
+                PersonInfo(**data) for data in state["persons"]
+            )
+        for url, score in state["frontier"]:
+            if url not in self.visited:
+                to_visit.push(url, score)
+
+        print(
+            f"🔁 Reprise du crawling : {len(self.visited)} page(s) déjà visitée(s), "
+            f"{len(to_visit)} en file, {self.persons_found} personne(s) déjà trouvée(s)"
+        )
+        return True
+
+    def print_page_header(self, url: str, score: int):
+        """Affiche la page en cours de traitement"""
+        score_emoji = "🔥" if score >= 9 else "⭐" if score >= 8 else "📄"
+        print(
+            f"{score_emoji} Page {len(self.visited)}/{self.max_pages} (score:{score}): {url}"
+        )
+
+    def analyze_page(
+        self, html: str, url: str, persons: bool = True
+    ) -> Tuple[bool, List[PersonInfo], list]:
+        """Analyse une page : langue supportée, personnes et liens découverts
+
+        Avec `persons=False`, seuls les liens sont extraits (page quasi
+        identique à une page déjà analysée).
+        """
+        # Parser une seule fois, le DOM est partagé par toutes les étapes
+        page = ParsedPage(html, url)
+
+        # Vérifier si la page est dans une langue supportée (FR/EN)
+        if not self.is_supported_language(page):
+            return False, [], []
+
+        found = self.extract_persons_from_page(page, url) if persons else []
+        links = self.extract_links(page, url)
+        return True, found, links
+
+    def lookup_previous_results(
+        self, url: str, html: str
+    ) -> Tuple[Optional[str], Optional[tuple]]:
+        """Empreinte de la page et résultats précédents si elle n'a pas changé"""
+        if not self.fingerprints:
+            return None, None
+
+        fingerprint = self.fingerprints.fingerprint(html)
+        result = self.fingerprints.lookup(url, fingerprint)
+        if result:
+            print("   ♻️  Contenu inchangé, résultats précédents réutilisés")
+        return fingerprint, result
+
+    def record_yield(self, url: str, persons: int, to_visit: URLFrontier):
+        """Rendement de la page : ajuste la priorité des URLs de la même section
+
+        Après une page avec contacts, les URLs en file de mêmes sections/mots
+        remontent tout de suite ; les autres variations (baisses, taux moyen
+        du site) sont appliquées quand l'URL arrive en tête de file.
+        """
+        if self.prioritizer.record(url, persons):
+            to_visit.rescore(self.prioritizer.yield_stats.features(url))
+
+    def is_near_duplicate(self, html: str) -> bool:
+        """Vrai si la page est quasi identique à une page déjà analysée
+
+        Ses personnes ne sont alors pas extraites, mais ses liens le sont
+        toujours (listes paginées au gabarit commun, liens différents).
+        """
+        if not self.near_duplicates.is_duplicate(html):
+            return False
+        print("   🪞 Contenu quasi identique à une page déjà analysée, liens seuls")
+        return True
+
+    def process_page(
+        self, url: str, html: str, to_visit: URLFrontier, page_url: Optional[str] = None
+    ):
+        """Traite une page récupérée : analyse, affichage et nouveaux liens
+
+        `url` est la clé canonique de la page, `page_url` l'adresse réellement
+        récupérée (après redirections), base des liens relatifs.
+        """
+        near_duplicate = self.is_near_duplicate(html)
+        fingerprint, result = self.lookup_previous_results(url, html)
+        if result is None:
+            result = self.analyze_page(html, page_url or url, not near_duplicate)
+            if self.fingerprints and not near_duplicate:
+                self.fingerprints.save(url, fingerprint, *result)
+
+        self.apply_page_results(url, result, to_visit)
+
+    async def process_page_async(
+        self, url: str, html: str, to_visit: URLFrontier, page_url: Optional[str] = None
+    ):
+        """Comme process_page, mais l'analyse part dans le pool de processus
+
+        Pendant que les workers parsent et extraient, la boucle asyncio
+        continue de récupérer les pages suivantes.
+        """
+        near_duplicate = self.is_near_duplicate(html)
+        fingerprint, result = self.lookup_previous_results(url, html)
+        if result is None:
+            if self.extraction_pool is not None:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self.extraction_pool,
+                    analyze_page_in_worker,
+                    self.start_url,
+                    html,
+                    page_url or url,
+                    not near_duplicate,
+                    self.canonicalizer,
+                )
+            else:
+                result = self.analyze_page(html, page_url or url, not near_duplicate)
+            if self.fingerprints and not near_duplicate:
+                self.fingerprints.save(url, fingerprint, *result)
+
+        self.apply_page_results(url, result, to_visit)
+
+    def apply_page_results(self, url: str, result: tuple, to_visit: URLFrontier):
+        """Affiche les personnes trouvées et met les nouveaux liens en file"""
+        supported, persons, links = result
+        self.record_yield(url, len(persons) if supported else 0, to_visit)
+
+        if not supported:
+            print(f"   🚫 Langue non supportée, ignorée")
+            return
 
-            # Pause respectueuse
-            time.sleep(1)
+        self.emit_persons(persons)
 
-        # Déduplication finale globale entre toutes les pages
-        unique_persons = self.deduplicate_persons(all_persons)
+        if persons:
+            print(f"   👥 {len(persons)} personne(s) trouvée(s)")
 
-        print(f"\n✅ Crawling terminé - {len(unique_persons)} profils uniques trouvés")
+            for person in persons:
+                confidence_str = f"({person.confidence:.1f})"
+                name_str = person.nom or "❓"
+                phone_str = person.telephone or "❓"
+                print(
+                    f"      • {name_str} - {person.email} - {phone_str} {confidence_str}"
+                )
+
+        # Découvrir de nouveaux liens avec priorisation
+        if len(self.visited) < self.max_pages:
+            for link in links:
+                self.enqueue(to_visit, link)
+
+    def emit_persons(self, persons: List[PersonInfo]):
+        """Envoie aux sinks les personnes nouvelles ou mieux renseignées"""
+        for person in persons:
+            status = self.dedup.offer(person)
+            if status is None:
+                continue
+            if status == "new":
+                self.persons_found += 1
+                # La page en cours compte comme productive
+                self.last_new_person_page = self.pages_done + 1
+            for sink in self.sinks:
+                sink.write(person)
+
+    def finish_crawl(self) -> List[PersonInfo]:
+        """Déduplication finale globale entre toutes les pages"""
+        unique_persons = (
+            self.deduplicate_persons(self.memory_sink.persons)
+            if self.memory_sink
+            else []
+        )
+
+        if self.fingerprints and self.fingerprints.reused:
+            print(
+                f"\n♻️  {self.fingerprints.reused} page(s) inchangée(s), extraction évitée"
+            )
+        if self.near_duplicates.skipped:
+            print(
+                f"\n🪞 {self.near_duplicates.skipped} page(s) quasi identique(s), "
+                f"extraction des personnes évitée"
+            )
+        if self.cache and self.cache.revalidated:
+            print(f"\n♻️  {self.cache.revalidated} page(s) inchangée(s) servie(s) par le cache")
+        self.prioritizer.yield_stats.save()
+        print(f"\n✅ Crawling terminé - {self.persons_found} profils uniques trouvés")
         return unique_persons
 
-    def track_successful_pattern(self, url: str):
-        """Enregistre les patterns d'URLs qui ont donné des résultats"""
-        path = urlparse(url).path.lower()
-
-        # Identifier le pattern principal
-        if "/team" in path or "/equipe" in path:
-            self.successful_patterns.add("team")
-        elif "/contact" in path:
-            self.successful_patterns.add("contact")
-        elif "/about" in path or "/apropos" in path:
-            self.successful_patterns.add("about")
-        elif "/staff" in path or "/personnel" in path:
-            self.successful_patterns.add("staff")
-
-    def matches_successful_pattern(self, url: str) -> bool:
-        """Vérifie si une URL correspond à un pattern qui a déjà donné des résultats"""
-        path = urlparse(url).path.lower()
-
-        for pattern in self.successful_patterns:
-            if pattern in path:
-                return True
-        return False
+
+# === POOL D'EXTRACTION MULTI-PROCESSUS ===
+
+# État propre à chaque processus worker (initialisé une seule fois)
+_worker_extractor: Optional[IntelligentPersonExtractor] = None
+# Scrapers des derniers sites analysés (plusieurs sites en parallèle en batch)
+_worker_scrapers: "OrderedDict[tuple, SimpleScraper]" = OrderedDict()
+WORKER_SCRAPERS_MAX = 8
+
+
+def init_extraction_worker(ner_batch_size: int = 64):
+    """Initialise un worker : extracteur et modèle spaCy préchargés"""
+    global _worker_extractor
+    import signal
+
+    # Ctrl-C est géré par le processus principal, qui arrête proprement le
+    # crawling : le worker termine les pages en cours au lieu de mourir
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Le worker est déjà un processus dédié : NER sur un seul processus
+    _worker_extractor = IntelligentPersonExtractor(ner_batch_size=ner_batch_size)
+    _worker_extractor.load_spacy()
+
+
+def analyze_page_in_worker(
+    start_url: str,
+    html: str,
+    url: str,
+    persons: bool = True,
+    canonicalizer: Optional[URLCanonicalizer] = None,
+):
+    """Analyse une page dans un worker (langue, personnes, liens)
+
+    `canonicalizer` est celui du scraper parent : les liens sont filtrés et
+    dédoublonnés avec les mêmes règles (STRIP_PARAMS) que dans la file.
+    """
+    canonicalizer = canonicalizer or URLCanonicalizer()
+    key = (start_url, tuple(sorted(canonicalizer.strip_params)))
+    scraper = _worker_scrapers.get(key)
+    if scraper is None:
+        scraper = SimpleScraper(
+            start_url, extractor=_worker_extractor, canonicalizer=canonicalizer
+        )
+        _worker_scrapers[key] = scraper
+        if len(_worker_scrapers) > WORKER_SCRAPERS_MAX:
+            _worker_scrapers.popitem(last=False)
+    else:
+        _worker_scrapers.move_to_end(key)
+    return scraper.analyze_page(html, url, persons)
+
+
+def create_extraction_pool(workers: int, ner_batch_size: int = 64):
+    """Crée le pool de processus d'extraction (None si désactivé)"""
+    if workers <= 0:
+        return None
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    print(f"⚙️  Pool d'extraction : {workers} processus")
+    # Workers lancés à la première page, alors que threads et boucles asyncio
+    # tournent déjà : un fork copierait des verrous (logging, modèle spaCy)
+    # tenus par un autre thread. "spawn" part d'un interpréteur neuf.
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_extraction_worker,
+        initargs=(ner_batch_size,),
+    )
+
+
+# === MICRO-BENCHMARK ===
+
+
+def synthetic_directory_elements(
+    persons: int, spacing: int = 150
+) -> List[ExtractedElement]:
+    """Éléments d'une page annuaire fictive : nom, email, téléphone par fiche
+
+    Avec des fiches rapprochées (150 caractères), chaque fiche est sous le
+    seuil de proximité de la suivante : tout l'annuaire forme un seul grand
+    cluster, le pire cas de l'ancien clustering.
+    """
+    elements = []
+    for i in range(persons):
+        base = i * spacing
+        for offset, elem_type, value in (
+            (0, "name", f"Personne Numero{i}"),
+            (40, "email", f"personne{i}@exemple.fr"),
+            (80, "phone", f"01 23 45 {i // 100 % 100:02d} {i % 100:02d}"),
+        ):
+            elements.append(
+                ExtractedElement(
+                    type=elem_type,
+                    value=value,
+                    position=base + offset,
+                    html_position=0,
+                    context="",
+                    html_element="p",
+                    confidence=0.7,
+                )
+            )
+    return elements
+
+
+def scan_proximity_to_contacts(
+    extractor: IntelligentPersonExtractor, name_position: int, elements: list
+) -> float:
+    """Ancienne proximité (référence du benchmark) : parcours de tous les contacts"""
+    distances = [
+        abs(name_position - e.position) for e in elements if e.type in ("email", "phone")
+    ]
+    if not distances:
+        return 0.0
+    # Même barème que calculate_proximity_to_contacts
+    return extractor.calculate_proximity_to_contacts(
+        name_position, [name_position + min(distances)]
+    )
+
+
+def pairwise_cluster_by_proximity(
+    extractor: IntelligentPersonExtractor, elements: list
+) -> list:
+    """Ancien clustering (référence du benchmark) : chaque élément est comparé
+    à tous ceux du cluster courant, O(n²) sur un grand cluster"""
+    if not elements:
+        return []
+    if len({e.value for e in elements if e.type == "email"}) == 1:
+        return [elements]
+
+    clusters = []
+    current_cluster = [elements[0]]
+    for current_elem in elements[1:]:
+        if any(
+            abs(current_elem.position - existing_elem.position)
+            <= extractor.get_proximity_threshold(existing_elem, current_elem)
+            for existing_elem in current_cluster
+        ):
+            current_cluster.append(current_elem)
+        else:
+            clusters.append(current_cluster)
+            current_cluster = [current_elem]
+    clusters.append(current_cluster)
+    return clusters
+
+
+def time_per_call(function, repeat: int) -> float:
+    """Temps moyen d'un appel (secondes)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def run_benchmark(sizes=(250, 500, 1000, 2000), repeat: int = 5):
+    """Mesure proximité et clustering sur des annuaires fictifs denses
+
+    Compare les anciennes implémentations (parcours complet, comparaisons
+    deux à deux) aux nouvelles (bisect, balayage) : le temps par fiche des
+    nouvelles reste constant quand la page grandit, celui des anciennes
+    croît avec elle.
+    """
+    extractor = IntelligentPersonExtractor()
+    print("⏱️  Micro-benchmark proximité / clustering (annuaire fictif dense)")
+    print(
+        f"{'fiches':>8} {'proximité avant':>16} {'après':>10}"
+        f" {'clustering avant':>17} {'après':>10} {'µs/fiche avant':>15} {'après':>8}"
+    )
+
+    for persons in sizes:
+        elements = synthetic_directory_elements(persons)
+        names = [e for e in elements if e.type == "name"]
+
+        def new_proximity():
+            contact_positions = sorted(
+                e.position for e in elements if e.type in ("email", "phone")
+            )
+            for name in names:
+                extractor.calculate_proximity_to_contacts(
+                    name.position, contact_positions
+                )
+
+        def old_proximity():
+            for name in names:
+                scan_proximity_to_contacts(extractor, name.position, elements)
+
+        # Les anciennes versions, quadratiques, ne sont mesurées qu'une fois
+        start = time.perf_counter()
+        old_clusters = pairwise_cluster_by_proximity(extractor, elements)
+        old_clustering = time.perf_counter() - start
+        before = (time_per_call(old_proximity, 1), old_clustering)
+        after = (
+            time_per_call(new_proximity, repeat),
+            time_per_call(lambda: extractor.cluster_by_proximity(elements), repeat),
+        )
+        clusters = extractor.cluster_by_proximity(elements)
+        if clusters != old_clusters:
+            print(f"   ⚠️  Clusters différents pour {persons} fiches")
+        print(
+            f"{persons:>8} {before[0] * 1000:>14.1f}ms {after[0] * 1000:>8.2f}ms"
+            f" {before[1] * 1000:>15.1f}ms {after[1] * 1000:>8.2f}ms"
+            f" {sum(before) / persons * 1e6:>15.1f} {sum(after) / persons * 1e6:>8.2f}"
+        )
+
+    print(f"   ({len(clusters)} cluster(s) pour {sizes[-1]} fiches)")
 
 
 def load_env_config():
@@ -1456,7 +3790,36 @@ def load_env_config():
             config["supabase_key"] = os.getenv("SUPABASE_KEY", "").strip()
             config["default_max_pages"] = int(os.getenv("DEFAULT_MAX_PAGES", "50"))
             config["default_save_dir"] = os.getenv("DEFAULT_SAVE_DIR", ".").strip()
+            config["concurrency"] = int(os.getenv("CONCURRENCY", "1"))
+            config["requests_per_second"] = float(
+                os.getenv("REQUESTS_PER_SECOND", "1.0")
+            )
             config["default_url"] = os.getenv("DEFAULT_URL", "").strip()
+            config["extraction_workers"] = int(os.getenv("EXTRACTION_WORKERS", "0"))
+            config["supabase_batch_size"] = int(os.getenv("SUPABASE_BATCH_SIZE", "500"))
+            config["ner_batch_size"] = int(os.getenv("NER_BATCH_SIZE", "64"))
+            config["idle_pages"] = int(os.getenv("IDLE_PAGES", "30"))
+            config["strip_params"] = [
+                param for param in os.getenv("STRIP_PARAMS", "").split(",") if param.strip()
+            ]
+            config["near_duplicate_distance"] = int(
+                os.getenv("NEAR_DUPLICATE_DISTANCE", "3")
+            )
+            config["min_score"] = int(os.getenv("MIN_SCORE", "8"))
+            config["http_cache"] = os.getenv("HTTP_CACHE", "1").strip().lower() not in (
+                "0",
+                "false",
+                "non",
+            )
+            config["http_cache_max_mb"] = float(os.getenv("HTTP_CACHE_MAX_MB", "200"))
+            config["sitemap"] = os.getenv("SITEMAP", "1").strip().lower() not in (
+                "0",
+                "false",
+                "non",
+            )
+            config["http_cache_max_age_days"] = float(
+                os.getenv("HTTP_CACHE_MAX_AGE_DAYS", "30")
+            )
 
             if config["supabase_url"] and config["supabase_key"]:
                 print("✅ Configuration .env trouvée et chargée")
@@ -1563,59 +3926,44 @@ def get_user_config():
         "supabase_url": supabase_url,
         "supabase_key": supabase_key,
         "save_dir": save_dir,
+        "concurrency": env_config.get("concurrency", 1),
+        "requests_per_second": env_config.get("requests_per_second", 1.0),
+        "http_cache": env_config.get("http_cache", True),
+        "sitemap": env_config.get("sitemap", True),
+        "idle_pages": env_config.get("idle_pages", 30),
+        "min_score": env_config.get("min_score", 8),
+        "strip_params": env_config.get("strip_params", []),
+        "near_duplicate_distance": env_config.get("near_duplicate_distance", 3),
+        "http_cache_max_mb": env_config.get("http_cache_max_mb", 200),
+        "http_cache_max_age_days": env_config.get("http_cache_max_age_days", 30),
+        "extraction_workers": env_config.get("extraction_workers", 0),
+        "supabase_batch_size": env_config.get("supabase_batch_size", 500),
+        "ner_batch_size": env_config.get("ner_batch_size", 64),
     }
 
 
-def main():
-    """Fonction principale"""
-    print("🚀 Scraper Portable Auto-Installable")
-    print("=" * 40)
-
-    # Vérifications système
-    check_python_version()
-
-    # Installation automatique des dépendances
-    if not ensure_dependencies():
-        print("❌ Impossible d'installer les dépendances")
-        sys.exit(1)
-
-    # Configuration utilisateur
-    config = get_user_config()
-
-    # Initialisation Supabase
-    db = None
-    if config["supabase_url"] and config["supabase_key"]:
-        db = SimpleSupabaseManager(config["supabase_url"], config["supabase_key"])
-        if db.connect():
-            print("✅ Connexion Supabase réussie")
-        else:
-            print("⚠️  Connexion Supabase échouée, sauvegarde locale uniquement")
-            db = None
+def site_name_from_url(url: str) -> str:
+    """Nom du site utilisable dans un nom de fichier (ex: example_com)"""
+    domain = urlparse(url).netloc
+    site_name = domain.replace("www.", "").replace(".", "_")
+    # Nettoyer le nom (caractères valides pour fichier)
+    return re.sub(r"[^\w\-_]", "_", site_name)
 
-    # Lancement du scraping
-    scraper = SimpleScraper(config["url"], config["max_pages"])
-    persons = scraper.crawl()
 
-    # Sauvegarde des résultats
-    print(f"\n📊 Résultats: {len(persons)} personne(s) trouvée(s)")
+def site_key(url: str) -> str:
+    """Clé des fichiers d'un crawl (résultats, checkpoint, apprentissage)
 
-    # Sauvegarde Supabase
-    saved_to_db = 0
-    if db:
-        for person in persons:
-            if db.save_person(person):
-                saved_to_db += 1
-        print(f"💾 {saved_to_db} personne(s) sauvegardée(s) en base")
+    Nom du site + empreinte courte de l'URL de départ canonique : deux URLs
+    du même hôte, ou un site avec et sans www, ne partagent aucun fichier.
+    """
+    start_url = URLCanonicalizer().canonicalize(url)
+    digest = hashlib.sha1(start_url.encode("utf-8")).hexdigest()[:8]
+    return f"{site_name_from_url(url)}_{digest}"
 
-    # Sauvegarde locale JSON avec structure organisée par date
-    from urllib.parse import urlparse
-    import re
 
-    # Extraire le nom du site web
-    domain = urlparse(config["url"]).netloc
-    site_name = domain.replace("www.", "").replace(".", "_")
-    # Nettoyer le nom (caractères valides pour fichier)
-    site_name = re.sub(r"[^\w\-_]", "_", site_name)
+def build_output_path(save_dir: str, url: str) -> str:
+    """Chemin du fichier de résultats : saves/AAAA/MM-Mois/JJ/HHhMM_site_scraping.json"""
+    site_name = site_key(url)
 
     # Date et heure formatées
     now = datetime.now()
@@ -1641,7 +3989,7 @@ def main():
     time_str = now.strftime("%Hh%M")
 
     # Créer la structure de dossiers : saves/2025/09-Septembre/29/
-    base_save_dir = os.path.join(config["save_dir"], "saves")
+    base_save_dir = os.path.join(save_dir, "saves")
     date_dir = os.path.join(base_save_dir, year, month_folder, day)
 
     # Créer les dossiers s'ils n'existent pas
@@ -1649,17 +3997,366 @@ def main():
 
     # Nom de fichier avec horodatage
     filename = f"{time_str}_{site_name}_scraping.json"
-    output_file = os.path.join(date_dir, filename)
+    return os.path.join(date_dir, filename)
+
+
+def parse_args(argv=None):
+    """Options de la ligne de commande
+
+    Sans URL, le script reste interactif. Avec une ou plusieurs URLs (en
+    argument, dans un fichier ou sur stdin), il tourne sans aucune question.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Scraper Portable - extraction de contacts"
+    )
+    parser.add_argument("urls", nargs="*", help="URL(s) des sites à scraper")
+    parser.add_argument(
+        "-f",
+        "--urls-file",
+        help="fichier contenant une URL par ligne ('-' pour lire stdin)",
+    )
+    parser.add_argument("--max-pages", type=int, help="nombre max de pages par site")
+    parser.add_argument("--save-dir", help="dossier de sauvegarde des résultats")
+    parser.add_argument(
+        "--concurrency", type=int, help="requêtes simultanées par site"
+    )
+    parser.add_argument(
+        "--rate", type=float, help="requêtes par seconde maximum vers chaque site"
+    )
+    parser.add_argument(
+        "--parallel-sites",
+        type=int,
+        default=1,
+        help="nombre de sites crawlés en parallèle (mode batch)",
+    )
+    parser.add_argument(
+        "--extraction-workers",
+        type=int,
+        help="processus dédiés à l'extraction (0 = aucun, utile avec --concurrency > 1)",
+    )
+    parser.add_argument(
+        "--no-supabase", action="store_true", help="sauvegarde locale uniquement"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="désactiver le cache HTTP local"
+    )
+    parser.add_argument(
+        "--idle-pages",
+        type=int,
+        help="arrêter après N pages sans nouveau contact (0 = jamais)",
+    )
+    parser.add_argument(
+        "--min-score",
+        type=int,
+        help="... sauf s'il reste en file une page de score au moins égal",
+    )
+    parser.add_argument(
+        "--no-sitemap",
+        action="store_true",
+        help="ne pas lire robots.txt / sitemap.xml avant le crawling",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="reprendre le dernier crawling interrompu de ce site",
+    )
+    parser.add_argument(
+        "--check-deps",
+        action="store_true",
+        help="revérifier les dépendances même si l'environnement est inchangé",
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="mesurer proximité/clustering sur des annuaires fictifs puis quitter",
+    )
+    return parser.parse_args(argv)
+
+
+def read_batch_urls(args) -> List[str]:
+    """URLs passées en argument et/ou lues depuis un fichier (ou stdin)"""
+    urls = list(args.urls)
+
+    if args.urls_file:
+        if args.urls_file == "-":
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(args.urls_file, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        # Ignorer lignes vides et commentaires
+        urls.extend(
+            line.strip()
+            for line in lines
+            if line.strip() and not line.strip().startswith("#")
+        )
+
+    # Supprimer les doublons en gardant l'ordre (même URL de départ canonique,
+    # qui partagerait les fichiers du crawl)
+    unique = {}
+    for url in urls:
+        unique.setdefault(site_key(url), url)
+    return list(unique.values())
 
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump([asdict(p) for p in persons], f, ensure_ascii=False, indent=2)
 
+def get_cli_config(args) -> dict:
+    """Configuration non interactive : .env + options de la ligne de commande"""
+    env_config = load_env_config()
+
+    save_dir = args.save_dir or env_config.get("default_save_dir", ".") or "."
+    if not os.path.exists(save_dir):
+        print(
+            f"⚠️  Le dossier {save_dir} n'existe pas, utilisation du répertoire courant"
+        )
+        save_dir = "."
+
+    return {
+        "max_pages": args.max_pages or env_config.get("default_max_pages", 50),
+        "supabase_url": "" if args.no_supabase else env_config.get("supabase_url", ""),
+        "supabase_key": "" if args.no_supabase else env_config.get("supabase_key", ""),
+        "save_dir": save_dir,
+        "concurrency": args.concurrency or env_config.get("concurrency", 1),
+        "requests_per_second": args.rate or env_config.get("requests_per_second", 1.0),
+        "http_cache": not args.no_cache and env_config.get("http_cache", True),
+        "sitemap": not args.no_sitemap and env_config.get("sitemap", True),
+        "idle_pages": (
+            args.idle_pages
+            if args.idle_pages is not None
+            else env_config.get("idle_pages", 30)
+        ),
+        "min_score": (
+            args.min_score
+            if args.min_score is not None
+            else env_config.get("min_score", 8)
+        ),
+        "strip_params": env_config.get("strip_params", []),
+        "near_duplicate_distance": env_config.get("near_duplicate_distance", 3),
+        "http_cache_max_mb": env_config.get("http_cache_max_mb", 200),
+        "http_cache_max_age_days": env_config.get("http_cache_max_age_days", 30),
+        "extraction_workers": (
+            args.extraction_workers
+            if args.extraction_workers is not None
+            else env_config.get("extraction_workers", 0)
+        ),
+        "supabase_batch_size": env_config.get("supabase_batch_size", 500),
+        "ner_batch_size": env_config.get("ner_batch_size", 64),
+    }
+
+
+def scrape_site(
+    url: str,
+    config: dict,
+    extractor: IntelligentPersonExtractor,
+    db: Optional[SimpleSupabaseManager] = None,
+    cache: Optional[HTTPResponseCache] = None,
+    fingerprints: Optional[ContentFingerprintStore] = None,
+    resume: bool = False,
+    extraction_pool=None,
+    stop_event: Optional[threading.Event] = None,
+) -> Tuple[int, List[PersonInfo]]:
+    """Crawle un site en envoyant les résultats au fil de l'eau (JSON + Supabase)
+
+    Retourne le nombre de personnes trouvées et les meilleures d'entre elles.
+    """
+    checkpoint = CrawlCheckpoint(
+        os.path.join(
+            config["save_dir"],
+            "saves",
+            ".checkpoints",
+            f"{site_key(url)}.json.gz",
+        )
+    )
+
+    # En reprise, on continue d'écrire dans les fichiers du crawling interrompu
+    state = checkpoint.load() if resume else None
+    output_file = (state or {}).get("output_file") or build_output_path(
+        config["save_dir"], url
+    )
+
+    # Sauvegarde locale : JSON Lines immédiat + JSON indenté final
+    jsonl_sink = JSONLinesSink(
+        os.path.splitext(output_file)[0] + ".jsonl", append=state is not None
+    )
+    json_sink = JSONFileSink(output_file, jsonl_sink)
+    sinks: List[ResultSink] = [jsonl_sink, json_sink]
+    # Sauvegarde Supabase (par lots)
+    db_sink = SupabaseSink(db) if db else None
+    if db_sink:
+        sinks.append(db_sink)
+
+    scraper = SimpleScraper(
+        url,
+        config["max_pages"],
+        concurrency=config["concurrency"],
+        requests_per_second=config["requests_per_second"],
+        cache=cache,
+        fingerprints=fingerprints,
+        checkpoint=checkpoint,
+        resume=resume,
+        extractor=extractor,
+        extraction_pool=extraction_pool,
+        sinks=sinks,
+        checkpoint_metadata={"output_file": output_file},
+        discover=config["sitemap"],
+        idle_pages_limit=config["idle_pages"],
+        min_frontier_score=config["min_score"],
+        canonicalizer=URLCanonicalizer(config["strip_params"]),
+        near_duplicate_distance=config["near_duplicate_distance"],
+        stop_event=stop_event,
+        # Rendement des sections du site, appris d'un crawl à l'autre
+        yield_stats=URLYieldStats(
+            os.path.join(
+                config["save_dir"],
+                "saves",
+                ".learning",
+                f"{site_key(url)}.json",
+            )
+        ),
+    )
+    print(f"📝 Résultats en direct dans: {jsonl_sink.path}")
+    try:
+        scraper.crawl()
+    finally:
+        scraper.close()
+        for sink in sinks:
+            sink.close()
+
+    # Sauvegarde des résultats
+    print(f"\n📊 Résultats {url}: {json_sink.count} personne(s) trouvée(s)")
+    if db_sink:
+        print(f"💾 {db_sink.saved} personne(s) sauvegardée(s) en base")
     print(f"📁 Résultats sauvés dans: {output_file}")
+    return json_sink.count, json_sink.preview
+
+
+def main():
+    """Fonction principale"""
+    args = parse_args()
+
+    print("🚀 Scraper Portable Auto-Installable")
+    print("=" * 40)
+
+    # Vérifications système
+    check_python_version()
+
+    # Micro-benchmark : aucune dépendance externe nécessaire
+    if args.benchmark:
+        run_benchmark()
+        return
+
+    # Installation automatique des dépendances
+    if not ensure_dependencies(force=args.check_deps):
+        print("❌ Impossible d'installer les dépendances")
+        sys.exit(1)
+
+    # Configuration : ligne de commande (batch) ou questions interactives
+    urls = read_batch_urls(args)
+    if urls:
+        config = get_cli_config(args)
+    else:
+        config = get_user_config()
+        urls = [config["url"]]
+
+    # Initialisation Supabase
+    db = None
+    if config["supabase_url"] and config["supabase_key"]:
+        db = SimpleSupabaseManager(
+            config["supabase_url"],
+            config["supabase_key"],
+            batch_size=config["supabase_batch_size"],
+        )
+        if db.connect():
+            print("✅ Connexion Supabase réussie")
+        else:
+            print("⚠️  Connexion Supabase échouée, sauvegarde locale uniquement")
+            db = None
+
+    # Cache HTTP local (saves/.cache/) pour les re-crawls
+    cache = None
+    fingerprints = None
+    if config["http_cache"]:
+        cache = HTTPResponseCache(
+            os.path.join(config["save_dir"], "saves", ".cache", "http_cache.sqlite3"),
+            max_size_mb=config["http_cache_max_mb"],
+            max_age_days=config["http_cache_max_age_days"],
+        )
+        # Empreintes de contenu : pas de ré-extraction des pages inchangées
+        fingerprints = ContentFingerprintStore(
+            os.path.join(config["save_dir"], "saves", ".cache", "fingerprints.sqlite3")
+        )
+
+    # Un seul extracteur (et un seul modèle spaCy) pour tous les sites
+    extractor = IntelligentPersonExtractor(ner_batch_size=config["ner_batch_size"])
+    # Pool de processus optionnel : chaque worker a son propre extracteur
+    extraction_pool = create_extraction_pool(
+        config["extraction_workers"], config["ner_batch_size"]
+    )
+
+    # Ctrl-C n'atteint que le thread principal : les sites du batch sont
+    # prévenus par cet événement et sauvegardent leur checkpoint
+    stop_event = threading.Event()
+
+    def run_site(url):
+        return scrape_site(
+            url,
+            config,
+            extractor,
+            db,
+            cache,
+            fingerprints,
+            args.resume,
+            extraction_pool,
+            stop_event,
+        )
+
+    results: Dict[str, Tuple[int, List[PersonInfo]]] = {}
+    try:
+        if len(urls) == 1:
+            results[urls[0]] = run_site(urls[0])
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            parallel_sites = max(1, args.parallel_sites)
+            print(f"\n📚 Mode batch : {len(urls)} sites, {parallel_sites} en parallèle")
+
+            def run(url):
+                try:
+                    return run_site(url)
+                except Exception as e:
+                    print(f"❌ Erreur sur {url}: {e}")
+                    return 0, []
+
+            pool = ThreadPoolExecutor(max_workers=parallel_sites)
+            try:
+                futures = [pool.submit(run, url) for url in urls]
+                for url, future in zip(urls, futures):
+                    results[url] = future.result()
+            except KeyboardInterrupt:
+                print("\n🛑 Arrêt demandé, sauvegarde de la progression des sites...")
+                stop_event.set()
+                # Sites pas encore commencés annulés, sites en cours arrêtés
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+            pool.shutdown()
+    finally:
+        if extraction_pool is not None:
+            extraction_pool.shutdown()
+        if cache:
+            cache.close()
+        if fingerprints:
+            fingerprints.close()
 
     # Affichage exemples
-    print("\n👥 Exemples trouvés:")
-    for i, person in enumerate(persons[:3]):
-        print(f"  {i+1}. {person.nom} - {person.email} - {person.telephone}")
+    if len(results) == 1:
+        _, preview = next(iter(results.values()))
+        print("\n👥 Exemples trouvés:")
+        for i, person in enumerate(preview):
+            print(f"  {i+1}. {person.nom} - {person.email} - {person.telephone}")
+    else:
+        print("\n📊 Récapitulatif du batch:")
+        for url, (count, _) in results.items():
+            print(f"  • {url}: {count} personne(s)")
 
     print("\n✅ Scraping terminé!")
 
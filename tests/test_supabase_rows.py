@@ -0,0 +1,66 @@
+"""Les lignes envoyées à Supabase respectent les CHECK de recreate_table.sql"""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from portable_scraper import PersonInfo, SimpleSupabaseManager
+
+SQL = (Path(__file__).resolve().parent.parent / "recreate_table.sql").read_text(
+    encoding="utf-8"
+)
+
+
+def check_pattern(column: str) -> re.Pattern:
+    """Regex du CHECK `column ~* '...'` de la table (insensible à la casse)"""
+    match = re.search(rf"{column} ~\* '([^']+)'", SQL)
+    assert match, f"CHECK introuvable pour {column}"
+    return re.compile(match.group(1), re.I)
+
+
+EMAIL_CHECK = check_pattern("email")
+PHONE_CHECK = check_pattern("telephone")
+
+
+def satisfies_checks(row: dict) -> bool:
+    """Équivalent Python des contraintes CHECK de la table personnes"""
+    return (
+        EMAIL_CHECK.fullmatch(row["email"]) is not None
+        and (row["telephone"] is None or PHONE_CHECK.fullmatch(row["telephone"]))
+        and 0.0 <= row["confidence"] <= 1.0
+    )
+
+
+@pytest.fixture
+def manager():
+    return SimpleSupabaseManager("https://exemple.supabase.co", "cle")
+
+
+@pytest.mark.parametrize(
+    "telephone, expected",
+    [
+        ("", None),
+        ("Tél abc", None),
+        ("01 23", None),
+        ("01 23 45 67 89", "01 23 45 67 89"),
+        ("+33 1 23 45 67 89", "+33 1 23 45 67 89"),
+    ],
+)
+def test_row_phone_satisfies_check(manager, telephone, expected):
+    person = PersonInfo(
+        nom="Marie Dupont",
+        email="marie.dupont@exemple.fr",
+        telephone=telephone,
+        source_url="https://exemple.fr/equipe",
+        confidence=1.4,
+    )
+    row = manager.to_row(person)
+
+    assert row["telephone"] == expected
+    assert satisfies_checks(row)
+
+
+@pytest.mark.parametrize("email", ["", "marie", "marie@exemple", "a@b.fr\n"])
+def test_row_rejected_when_email_fails_check(manager, email):
+    assert manager.to_row(PersonInfo(email=email)) is None